@@ -0,0 +1,60 @@
+"""Add indexes for answers lookups and created_at ordering
+
+Revision ID: 5c2e8f1a9b7d
+Revises: ae3a2fdffbe4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8f1a9b7d"
+down_revision: Union[str, Sequence[str], None] = "ae3a2fdffbe4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently on PostgreSQL so existing tables stay writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_answers_question_id_created_at_id",
+            "answers",
+            ["question_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_answers_created_at_id",
+            "answers",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_answers_user_id"),
+            "answers",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_questions_created_at_id",
+            "questions",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_questions_created_at_id", table_name="questions")
+    op.drop_index(op.f("ix_answers_user_id"), table_name="answers")
+    op.drop_index("ix_answers_created_at_id", table_name="answers")
+    op.drop_index("ix_answers_question_id_created_at_id", table_name="answers")
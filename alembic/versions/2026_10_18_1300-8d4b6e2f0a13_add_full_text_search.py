@@ -0,0 +1,61 @@
+"""Add full-text search vectors to questions and answers
+
+Revision ID: 8d4b6e2f0a13
+Revises: 5c2e8f1a9b7d
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4b6e2f0a13"
+down_revision: Union[str, Sequence[str], None] = "5c2e8f1a9b7d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored generated columns are filled for existing rows by a table rewrite
+    for table in ("questions", "answers"):
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed("to_tsvector('english', text)", persisted=True),
+                nullable=False,
+            ),
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_questions_search_vector",
+            "questions",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_answers_search_vector",
+            "answers",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_answers_search_vector", table_name="answers")
+    op.drop_index("ix_questions_search_vector", table_name="questions")
+    op.drop_column("answers", "search_vector")
+    op.drop_column("questions", "search_vector")
@@ -0,0 +1,73 @@
+"""Add denormalized answer_count and last_answer_at to questions
+
+Revision ID: b7e1c9d34f20
+Revises: 8d4b6e2f0a13
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e1c9d34f20"
+down_revision: Union[str, Sequence[str], None] = "8d4b6e2f0a13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default doesn't rewrite the table on PostgreSQL 11+
+    op.add_column(
+        "questions",
+        sa.Column("answer_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "questions",
+        sa.Column("last_answer_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Backfill
+    op.execute(
+        """
+        UPDATE questions
+        SET answer_count = counts.answer_count,
+            last_answer_at = counts.last_answer_at
+        FROM (
+            SELECT question_id,
+                   count(*) AS answer_count,
+                   max(created_at) AS last_answer_at
+            FROM answers
+            GROUP BY question_id
+        ) AS counts
+        WHERE questions.id = counts.question_id
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_questions_answer_count_id",
+            "questions",
+            ["answer_count", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_questions_last_answer_at_id",
+            "questions",
+            ["last_answer_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_questions_last_answer_at_id", table_name="questions")
+    op.drop_index("ix_questions_answer_count_id", table_name="questions")
+    op.drop_column("questions", "last_answer_at")
+    op.drop_column("questions", "answer_count")
@@ -0,0 +1,41 @@
+"""Add partial index for unanswered questions by creation time
+
+Revision ID: e4a8c2d6f1b9
+Revises: b7e1c9d34f20
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a8c2d6f1b9"
+down_revision: Union[str, Sequence[str], None] = "b7e1c9d34f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_questions_unanswered_created_at_id",
+            "questions",
+            ["answer_count", "created_at", "id"],
+            unique=False,
+            postgresql_where=sa.text("answer_count = 0"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_questions_unanswered_created_at_id",
+        table_name="questions",
+        postgresql_where=sa.text("answer_count = 0"),
+    )
@@ -0,0 +1,37 @@
+"""Add resource_versions counters for cheap listing versions
+
+Revision ID: c3f7a91d5e28
+Revises: e4a8c2d6f1b9
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f7a91d5e28"
+down_revision: Union[str, Sequence[str], None] = "e4a8c2d6f1b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    resource_versions = op.create_table(
+        "resource_versions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.bulk_insert(resource_versions, [{"name": "questions"}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("resource_versions")
@@ -0,0 +1,113 @@
+"""Keep the answer counters of questions with triggers on answers
+
+Revision ID: 1c2e409fa8bd
+Revises: c3f7a91d5e28
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1c2e409fa8bd"
+down_revision: Union[str, Sequence[str], None] = "c3f7a91d5e28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION count_added_answers() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE questions
+            SET answer_count = questions.answer_count + added.answer_count,
+                last_answer_at = greatest(questions.last_answer_at, added.last_answer_at)
+            FROM (
+                SELECT question_id,
+                       count(*) AS answer_count,
+                       max(created_at) AS last_answer_at
+                FROM added_answers
+                GROUP BY question_id
+            ) AS added
+            WHERE questions.id = added.question_id;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION count_deleted_answers() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM FROM questions
+            WHERE id IN (SELECT question_id FROM deleted_answers)
+            ORDER BY id
+            FOR NO KEY UPDATE;
+
+            UPDATE questions
+            SET answer_count = questions.answer_count - deleted.answer_count,
+                last_answer_at = (
+                    SELECT max(created_at) FROM answers
+                    WHERE answers.question_id = questions.id
+                )
+            FROM (
+                SELECT question_id, count(*) AS answer_count
+                FROM deleted_answers
+                GROUP BY question_id
+            ) AS deleted
+            WHERE questions.id = deleted.question_id;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    # CREATE TRIGGER blocks writes to answers until the backfill below commits
+    op.execute(
+        """
+        CREATE TRIGGER answers_count_added AFTER INSERT ON answers
+        REFERENCING NEW TABLE AS added_answers
+        FOR EACH STATEMENT EXECUTE FUNCTION count_added_answers()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER answers_count_deleted AFTER DELETE ON answers
+        REFERENCING OLD TABLE AS deleted_answers
+        FOR EACH STATEMENT EXECUTE FUNCTION count_deleted_answers()
+        """
+    )
+
+    # Recount, answers deleted with their user were never uncounted
+    op.execute(
+        """
+        UPDATE questions
+        SET answer_count = counts.answer_count,
+            last_answer_at = counts.last_answer_at
+        FROM (
+            SELECT questions.id,
+                   count(answers.id) AS answer_count,
+                   max(answers.created_at) AS last_answer_at
+            FROM questions
+            LEFT JOIN answers ON answers.question_id = questions.id
+            GROUP BY questions.id
+        ) AS counts
+        WHERE questions.id = counts.id
+          AND (questions.answer_count, questions.last_answer_at)
+              IS DISTINCT FROM (counts.answer_count, counts.last_answer_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER answers_count_deleted ON answers")
+    op.execute("DROP TRIGGER answers_count_added ON answers")
+    op.execute("DROP FUNCTION count_deleted_answers()")
+    op.execute("DROP FUNCTION count_added_answers()")
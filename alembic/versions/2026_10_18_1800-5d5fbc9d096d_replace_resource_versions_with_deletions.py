@@ -0,0 +1,74 @@
+"""Replace the resource_versions counter with a log of deletions
+
+Revision ID: 5d5fbc9d096d
+Revises: 1c2e409fa8bd
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d5fbc9d096d"
+down_revision: Union[str, Sequence[str], None] = "1c2e409fa8bd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_table("resource_versions")
+    op.create_table(
+        "deletions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION log_deletion() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            logged_id integer;
+        BEGIN
+            IF NOT EXISTS (SELECT FROM deleted_rows) THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO deletions DEFAULT VALUES RETURNING id INTO logged_id;
+            DELETE FROM deletions
+            WHERE id IN (
+                SELECT id FROM deletions WHERE id < logged_id FOR UPDATE SKIP LOCKED
+            );
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for table in ("questions", "answers"):
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_log_deleted AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS deleted_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION log_deletion()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("answers", "questions"):
+        op.execute(f"DROP TRIGGER {table}_log_deleted ON {table}")
+    op.execute("DROP FUNCTION log_deletion()")
+    op.drop_table("deletions")
+    resource_versions = op.create_table(
+        "resource_versions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.bulk_insert(resource_versions, [{"name": "questions"}])
@@ -2,4 +2,5 @@ echo "Running database migrations..."
 alembic upgrade head
 
 echo "Starting application..."
-uvicorn app.app:app --host 0.0.0.0 --port 8000
+# exec so gunicorn gets the container's SIGTERM and shuts down gracefully
+exec python src/main.py
@@ -1,12 +1,25 @@
-from fastapi import FastAPI
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_pagination import add_pagination
 from fastapi_pagination.utils import disable_installed_extensions_check
 
+from app.middleware import MetricsMiddleware
 from app.routers import router as api_router
+from core import db_helper
 from users import router as users_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
+    yield
+    # The server has drained in-flight requests by now
+    await db_helper.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 add_pagination(app)
 disable_installed_extensions_check()
 
@@ -22,5 +35,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def stick_reads_to_primary(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        db_helper.stick_to_primary(response)
+    return response
+
+
+# Added last to be the outermost and time the other middleware too
+app.add_middleware(MetricsMiddleware, routes=app.router.routes)
+
 app.include_router(api_router)
 app.include_router(users_router)
@@ -0,0 +1,44 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+BUDGET_ATTRIBUTE = "query_budget"
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Most database work a route or service method may do on its success path,
+    enforced by the tests.
+
+    statements: statements the code executes
+    round_trips: trips to the database, the statements, the batches some
+        of them are split into, BEGIN, COMMIT and ROLLBACK
+    rows: rows a single statement may fetch, None when it's unbounded
+    """
+
+    statements: int
+    round_trips: int
+    rows: int | None
+
+
+def query_budget(
+    statements: int, round_trips: int | None = None, rows: int | None = None
+) -> Callable[[F], F]:
+    """Declare the query budget of a route or service method, by default
+    within one transaction: round_trips is statements + BEGIN + COMMIT"""
+
+    def decorator(func: F) -> F:
+        setattr(
+            func,
+            BUDGET_ATTRIBUTE,
+            QueryBudget(statements, round_trips or statements + 2, rows),
+        )
+        return func
+
+    return decorator
+
+
+def get_query_budget(func: Callable) -> QueryBudget | None:
+    return getattr(func, BUDGET_ATTRIBUTE, None)
@@ -0,0 +1,90 @@
+from collections.abc import Sequence
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core import settings
+from core.metrics import (
+    HTTP_REQUEST_DB_SECONDS,
+    HTTP_REQUEST_DB_STATEMENTS,
+    HTTP_REQUEST_DURATION_SECONDS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    HTTP_REQUESTS_TOTAL,
+    RequestTimings,
+    request_timings,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_path(routes: Sequence[BaseRoute], scope: Scope) -> str:
+    """Path template of the route the request goes to, so that labels
+    don't grow with every id"""
+
+    partial = UNMATCHED_ROUTE
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial == UNMATCHED_ROUTE:
+            partial = route.path
+    return partial
+
+
+def server_timing(timings: RequestTimings, total_seconds: float) -> str:
+    return (
+        f"db;dur={timings.statement_seconds * 1000:.3f}"
+        f';desc="{timings.statements} statements"'
+        f", pool;dur={timings.pool_wait_seconds * 1000:.3f}"
+        f", total;dur={total_seconds * 1000:.3f}"
+    )
+
+
+class MetricsMiddleware:
+    """Records the count, latency, concurrency and database time of requests
+    per route, and reports the request's timings in a Server-Timing header
+    when settings.api.server_timing is on.
+
+    A plain ASGI middleware, so the latency of streamed responses covers
+    their whole body."""
+
+    def __init__(self, app: ASGIApp, routes: Sequence[BaseRoute]):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_path(self.routes, scope)
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        status = 500
+        start = perf_counter()
+
+        async def send_with_timings(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.api.server_timing:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", server_timing(timings, perf_counter() - start)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            elapsed = perf_counter() - start
+            request_timings.reset(token)
+            in_progress.dec()
+            HTTP_REQUESTS_TOTAL.labels(method, route, str(status)).inc()
+            HTTP_REQUEST_DURATION_SECONDS.labels(method, route).observe(elapsed)
+            HTTP_REQUEST_DB_SECONDS.labels(method, route).observe(timings.db_seconds)
+            HTTP_REQUEST_DB_STATEMENTS.labels(method, route).observe(timings.statements)
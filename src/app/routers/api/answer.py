@@ -1,18 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.budget import query_budget
 from app.schemas import AnswerResponse
+from app.serialization import json_response
 from app.services import AnswerService
+from app.services.cache import Version
 from core import db_helper, get_logger
 from users import User, current_user
+from .conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/answers", tags=["answers"])
 
 
 @router.get("/{answer_id}", response_model=AnswerResponse)
+@query_budget(statements=1, rows=1)
 async def get_answer(
-    answer_id: int, session: AsyncSession = Depends(db_helper.get_scoped_session)
+    request: Request,
+    response: Response,
+    answer_id: int,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
 ):
     logger.info(f"Getting answer with id {answer_id}")
     try:
@@ -22,13 +35,22 @@ async def get_answer(
         logger.error(f"AnswerService.get_answer method returned a KeyError: {e}")
         raise HTTPException(status_code=404, detail=str(e))
 
-    return answer
+    # Answers never change after creation, so this is their whole version
+    version = Version.of(answer.created_at, answer.id)
+    etag = make_etag(version)
+    if is_not_modified(request, etag, version.last_modified, use_last_modified=True):
+        return not_modified_response(etag, version.last_modified)
+
+    headers = validator_headers(etag, version.last_modified)
+    response.headers.update(headers)
+    return json_response(AnswerResponse, answer, headers=headers)
 
 
 @router.delete("/{answer_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(statements=3, rows=1)
 async def delete_answer(
     answer_id: int,
-    session: AsyncSession = Depends(db_helper.get_scoped_session),
+    session: AsyncSession = Depends(db_helper.session_dependency),
     user: User = Depends(current_user),
 ):
     logger.info(f"Deleting answer with id {answer_id}")
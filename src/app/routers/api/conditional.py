@@ -0,0 +1,99 @@
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+from typing import Any
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from app.serialization import dump_json
+from app.services.cache import CachedPayload, Version, get_cached, set_cached
+from core import db_helper
+
+
+def make_etag(version: Version, variant: str = "") -> str:
+    """Quoted tag of the version, with a hash of the variant as it may hold
+    characters an entity-tag can't, like the spaces of str(datetime)"""
+
+    if not variant:
+        return f'"{version.tag}"'
+    return f'"{version.tag}-{blake2b(variant.encode(), digest_size=8).hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.astimezone(UTC) if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: datetime | None = None,
+    use_last_modified: bool = False,
+) -> bool:
+    """Check the request's validators, If-Modified-Since is only used when asked
+    for, as Last-Modified misses deletions on anything but immutable resources"""
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if use_last_modified and if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+    return False
+
+
+def not_modified_response(etag: str, last_modified: datetime | None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified),
+    )
+
+
+async def cached_json_response(
+    request: Request,
+    key: str,
+    variant: str,
+    get_version: Callable[[], Awaitable[Version]],
+    load: Callable[[], Awaitable[Any]],
+    schema: type[BaseModel],
+) -> Response:
+    """Answer from the response cache, or with 304 after a cheap version query,
+    loading and serializing the full response only when it is really needed.
+    Clients reading their own writes skip the cache, which a reader on a lagging
+    replica may have filled, and refresh it from the primary. The version is
+    read again after loading, the payload is only cached when it didn't change
+    in between, so no entry pairs a version with a newer state"""
+
+    sticky = db_helper.sticks_to_primary(request)
+    entry = None if sticky else await get_cached(key, variant)
+    version = entry.version if entry else await get_version()
+    etag = make_etag(version, variant)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, version.last_modified)
+
+    if entry is None:
+        payload = dump_json(schema, await load())
+        entry = CachedPayload(version, payload)
+        if await get_version() == version:
+            await set_cached(key, variant, entry)
+
+    return Response(
+        entry.payload,
+        media_type="application/json",
+        headers=validator_headers(etag, version.last_modified),
+    )
@@ -1,17 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from fastapi_pagination import Page
-from fastapi_pagination.async_paginator import apaginate
+from datetime import datetime
+from typing import Any, Literal
 
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import Page, Params
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.budget import query_budget
 from app.schemas import (
     AnswerCreate,
     AnswerResponse,
+    BulkResult,
+    CursorPage,
     QuestionCreate,
     QuestionDetail,
+    QuestionFilters,
     QuestionResponse,
 )
-from app.services import AnswerService, QuestionService
+from app.serialization import json_response
+from app.services import AnswerService, ExportService, QuestionService
+from app.services.bulk import (
+    BULK_CHUNK_SIZE,
+    MAX_BULK_CHUNKS,
+    MAX_BULK_INSERT_ROUND_TRIPS,
+    MAX_BULK_ITEMS,
+    merge_errors,
+    validate_items,
+)
+from app.services.cache import QUESTIONS_KEY, question_key
+from .conditional import cached_json_response
 from core import db_helper, get_logger
 from users import User, current_user
 
@@ -20,47 +46,173 @@ router = APIRouter(prefix="/questions", tags=["questions"])
 
 
 @router.get("/", response_model=Page[QuestionResponse])
-async def list_questions(session: AsyncSession = Depends(db_helper.get_scoped_session)):
-    logger.info("Getting list of all questions")
+@query_budget(statements=4, rows=100)
+async def list_questions(
+    request: Request,
+    params: Params = Depends(),
+    filters: QuestionFilters = Depends(),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(f"Getting page {params.page} of questions with {filters}")
+    try:
+        logger.debug(
+            f"Running QuestionService.list_questions method with params = {params} and session = {session}"
+        )
+        response = await cached_json_response(
+            request,
+            QUESTIONS_KEY,
+            f"{params.page}:{params.size}:{filters.cache_variant}",
+            lambda: QuestionService.get_questions_version(session),
+            lambda: QuestionService.list_questions(session, params, filters),
+            Page[QuestionResponse],
+        )
+    except ValueError as e:
+        logger.error(
+            f"QuestionService.list_questions method returned a ValueError: {e}"
+        )
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return response
+
+
+@router.get("/search", response_model=Page[QuestionResponse])
+@query_budget(statements=2, rows=100)
+async def search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    include_answers: bool = False,
+    params: Params = Depends(),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(f"Searching page {params.page} of questions for: {q}")
     logger.debug(
-        f"Running QuestionService.list_questions method with session = {session}"
+        f"Running QuestionService.search_questions method with q = {q}"
+        f", include_answers = {include_answers}, params = {params} and session = {session}"
+    )
+    page = await QuestionService.search_questions(session, q, include_answers, params)
+    return json_response(Page[QuestionResponse], page)
+
+
+@router.get("/cursor", response_model=CursorPage[QuestionResponse])
+@query_budget(statements=1, rows=101)
+async def list_questions_cursor(
+    cursor: str | None = None,
+    size: int = Query(50, ge=1, le=100),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(f"Getting {size} questions after cursor: {cursor}")
+    try:
+        logger.debug(
+            f"Running QuestionService.list_questions_cursor method with cursor = {cursor} and session = {session}"
+        )
+        page = await QuestionService.list_questions_cursor(session, cursor, size)
+    except ValueError as e:
+        logger.error(
+            f"QuestionService.list_questions_cursor method returned a ValueError: {e}"
+        )
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return json_response(CursorPage[QuestionResponse], page)
+
+
+@router.get("/export", response_class=StreamingResponse)
+@query_budget(statements=1)
+async def export_questions(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(
+        f"Exporting questions created in [{created_after}, {created_before}) as {format}"
+    )
+    logger.debug(
+        f"Running ExportService.stream_questions method with session = {session}"
+    )
+    questions = ExportService.stream_questions(session, created_after, created_before)
+    if format == "csv":
+        return StreamingResponse(
+            ExportService.to_csv(questions),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="questions.csv"'},
+        )
+    return StreamingResponse(
+        ExportService.to_ndjson(questions), media_type="application/x-ndjson"
     )
-    return await apaginate(await QuestionService.list_questions(session))
 
 
 @router.get("/{question_id}", response_model=QuestionDetail)
+@query_budget(statements=4, rows=100)
 async def get_question(
-    question_id: int, session: AsyncSession = Depends(db_helper.get_scoped_session)
+    request: Request,
+    question_id: int,
+    answers_limit: int = Query(50, ge=0, le=100),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
 ):
     logger.info(f"Getting a question with id: {question_id}")
     try:
         logger.debug(
-            f"Running QuestionService.get_question method with question id: {question_id} and session: {session}"
+            f"Running QuestionService.get_question method with question id: {question_id}"
+            f", answers_limit: {answers_limit} and session: {session}"
+        )
+        response = await cached_json_response(
+            request,
+            question_key(question_id),
+            str(answers_limit),
+            lambda: QuestionService.get_question_version(question_id, session),
+            lambda: QuestionService.get_question(question_id, session, answers_limit),
+            QuestionDetail,
         )
-        question = await QuestionService.get_question(question_id, session)
     except KeyError as e:
         logger.error(f"QuestionService.get_question method returned a KeyError: {e}")
         raise HTTPException(status_code=404, detail=str(e))
 
-    return question
+    return response
 
 
 @router.post("/", response_model=QuestionResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(statements=1, rows=1)
 async def create_question(
     data: QuestionCreate,
-    session: AsyncSession = Depends(db_helper.get_scoped_session),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     logger.info("Creating a question with given data")
     logger.debug(
         f"Running QuestionService.create_question method with data = {data} and session = {session}"
     )
-    return await QuestionService.create_question(data, session)
+    question = await QuestionService.create_question(data, session)
+    return json_response(QuestionResponse, question, status.HTTP_201_CREATED)
+
+
+@router.post("/bulk", response_model=BulkResult[QuestionResponse])
+@query_budget(
+    statements=MAX_BULK_CHUNKS,
+    round_trips=MAX_BULK_INSERT_ROUND_TRIPS,
+    rows=BULK_CHUNK_SIZE,
+)
+async def create_questions(
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BULK_ITEMS),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
+    logger.info(f"Creating {len(items)} questions")
+    data, errors = validate_items(QuestionCreate, items)
+    logger.debug(
+        f"Running QuestionService.create_questions method with {len(data)} valid items"
+        f" and session = {session}"
+    )
+    questions, not_stored = await QuestionService.create_questions(data, session)
+    if not_stored:
+        logger.error(f"Inserting {len(not_stored)} of {len(items)} questions failed")
+    return json_response(
+        BulkResult[QuestionResponse],
+        {"items": questions, "errors": merge_errors(errors, not_stored)},
+    )
 
 
 @router.delete("/{question_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(statements=1, rows=1)
 async def delete_question(
     question_id: int,
-    session: AsyncSession = Depends(db_helper.get_scoped_session),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     logger.info(f"Deleting a question with id: {question_id}")
     try:
@@ -75,15 +227,72 @@ async def delete_question(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.get("/{question_id}/answers", response_model=Page[AnswerResponse])
+@query_budget(statements=3, rows=100)
+async def list_answers(
+    question_id: int,
+    params: Params = Depends(),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(
+        f"Getting page {params.page} of answers to question with id: {question_id}"
+    )
+    try:
+        logger.debug(
+            f"Running AnswerService.list_answers method with question_id = {question_id}"
+            f", params = {params} and session = {session}"
+        )
+        page = await AnswerService.list_answers(question_id, session, params)
+    except KeyError as e:
+        logger.error(f"AnswerService.list_answers method returned a KeyError: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return json_response(Page[AnswerResponse], page)
+
+
+@router.get("/{question_id}/answers/cursor", response_model=CursorPage[AnswerResponse])
+@query_budget(statements=2, rows=101)
+async def list_answers_cursor(
+    question_id: int,
+    cursor: str | None = None,
+    size: int = Query(50, ge=1, le=100),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(
+        f"Getting {size} answers to question with id: {question_id} after cursor: {cursor}"
+    )
+    try:
+        logger.debug(
+            f"Running AnswerService.list_answers_cursor method with question_id = {question_id}"
+            f", cursor = {cursor} and session = {session}"
+        )
+        page = await AnswerService.list_answers_cursor(
+            question_id, session, cursor, size
+        )
+    except ValueError as e:
+        logger.error(
+            f"AnswerService.list_answers_cursor method returned a ValueError: {e}"
+        )
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError as e:
+        logger.error(
+            f"AnswerService.list_answers_cursor method returned a KeyError: {e}"
+        )
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return json_response(CursorPage[AnswerResponse], page)
+
+
 @router.post(
     "/{question_id}/answers",
     response_model=AnswerResponse,
     status_code=status.HTTP_201_CREATED,
 )
+@query_budget(statements=3, rows=1)
 async def create_answer(
     question_id: int,
     data: AnswerCreate,
-    session: AsyncSession = Depends(db_helper.get_scoped_session),
+    session: AsyncSession = Depends(db_helper.session_dependency),
     user: User = Depends(current_user),
 ):
     logger.info(f"Creating an answer to question with id: {question_id}")
@@ -100,4 +309,41 @@ async def create_answer(
         logger.error(f"AnswerService.create_answer method returned a KeyError: {e}")
         raise HTTPException(status_code=404, detail=str(e))
 
-    return answer
+    return json_response(AnswerResponse, answer, status.HTTP_201_CREATED)
+
+
+@router.post("/{question_id}/answers/bulk", response_model=BulkResult[AnswerResponse])
+@query_budget(
+    statements=2 * MAX_BULK_CHUNKS + 1,
+    round_trips=MAX_BULK_INSERT_ROUND_TRIPS + MAX_BULK_CHUNKS + 1,
+    rows=BULK_CHUNK_SIZE,
+)
+async def create_answers(
+    question_id: int,
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BULK_ITEMS),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    user: User = Depends(current_user),
+):
+    logger.info(f"Creating {len(items)} answers to question with id: {question_id}")
+    data, errors = validate_items(AnswerCreate, items)
+    try:
+        logger.debug(
+            f"Running AnswerService.create_answers method with question_id = {question_id}"
+            f", {len(data)} valid items, session = {session} and user = {user}"
+        )
+        answers, not_stored = await AnswerService.create_answers(
+            question_id, data, session, user
+        )
+    except ValueError as e:
+        logger.error(f"AnswerService.create_answers method returned a ValueError: {e}")
+        raise HTTPException(status_code=401, detail=str(e))
+    except KeyError as e:
+        logger.error(f"AnswerService.create_answers method returned a KeyError: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if not_stored:
+        logger.error(f"Inserting {len(not_stored)} of {len(items)} answers failed")
+    return json_response(
+        BulkResult[AnswerResponse],
+        {"items": answers, "errors": merge_errors(errors, not_stored)},
+    )
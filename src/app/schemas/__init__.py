@@ -1,10 +1,25 @@
 __all__ = (
     "AnswerCreate",
     "AnswerResponse",
+    "BulkItemError",
+    "BulkResult",
+    "CursorPage",
     "QuestionCreate",
     "QuestionDetail",
+    "QuestionFilters",
     "QuestionResponse",
+    "QuestionSort",
+    "SortDirection",
 )
 
 from .answer import AnswerResponse, AnswerCreate
-from .question import QuestionCreate, QuestionDetail, QuestionResponse
+from .bulk import BulkItemError, BulkResult
+from .pagination import CursorPage
+from .question import (
+    QuestionCreate,
+    QuestionDetail,
+    QuestionFilters,
+    QuestionResponse,
+    QuestionSort,
+    SortDirection,
+)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AnswerBase(BaseModel):
@@ -13,6 +13,8 @@ class AnswerCreate(AnswerBase):
 
 
 class AnswerResponse(AnswerBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     question_id: int
     user_id: UUID
@@ -0,0 +1,15 @@
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class BulkResult(BaseModel, Generic[T]):
+    items: list[T]
+    errors: list[BulkItemError] = []
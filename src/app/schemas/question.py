@@ -1,10 +1,29 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas import AnswerResponse
 
 
+QuestionSort = Literal["id", "created_at", "answer_count", "last_answer_at"]
+SortDirection = Literal["asc", "desc"]
+
+
+class QuestionFilters(BaseModel):
+    """Order and filters of the questions listing"""
+
+    sort: QuestionSort = "id"
+    direction: SortDirection = "asc"
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    has_answers: bool | None = None
+
+    @property
+    def cache_variant(self) -> str:
+        return ":".join(str(value) for value in self.model_dump().values())
+
+
 class QuestionBase(BaseModel):
     text: str = Field(..., min_length=1)
 
@@ -14,8 +33,12 @@ class QuestionCreate(QuestionBase):
 
 
 class QuestionResponse(QuestionBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     created_at: datetime
+    answer_count: int = 0
+    last_answer_at: datetime | None = None
 
 
 class QuestionDetail(QuestionResponse):
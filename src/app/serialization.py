@@ -0,0 +1,104 @@
+from collections.abc import Mapping, Sequence
+from functools import cache
+from operator import attrgetter, itemgetter
+from typing import Any, TypeVar, get_args, get_origin
+
+import orjson
+from fastapi import Response, status
+from pydantic import BaseModel
+
+from core import settings
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _tuple_getter(make_getter, names: list[str]):
+    """One C call fetching all names, as a tuple even for a single one"""
+
+    if not names:
+        return lambda obj: ()
+    get = make_getter(*names)
+    return get if len(names) > 1 else lambda obj: (get(obj),)
+
+
+class _Plan:
+    """How to read the fields of a response schema off any object"""
+
+    def __init__(self, schema: type[BaseModel]):
+        self.leaves = []
+        self.nested = []
+        for name, field in schema.model_fields.items():
+            annotation = field.annotation
+            many = get_origin(annotation) in (list, Sequence)
+            model = get_args(annotation)[0] if many else annotation
+            if isinstance(model, type) and issubclass(model, BaseModel):
+                self.nested.append((name, model, many))
+            else:
+                self.leaves.append(name)
+        self.get_attributes = _tuple_getter(attrgetter, self.leaves)
+        self.get_items = _tuple_getter(itemgetter, self.leaves)
+
+    def read(self, obj: Any) -> dict[str, Any]:
+        is_mapping = isinstance(obj, Mapping)
+        get_leaves = self.get_items if is_mapping else self.get_attributes
+        values = dict(zip(self.leaves, get_leaves(obj)))
+
+        for name, model, many in self.nested:
+            value = obj[name] if is_mapping else getattr(obj, name)
+            if value is not None:
+                plan = _plan(model)
+                value = (
+                    [plan.read(item) for item in value] if many else plan.read(value)
+                )
+            values[name] = value
+        return values
+
+
+@cache
+def _plan(schema: type[BaseModel]) -> _Plan:
+    return _Plan(schema)
+
+
+def to_jsonable(schema: type[BaseModel], obj: Any) -> dict[str, Any]:
+    """Fields of schema read off a model, an ORM entity or a mapping,
+    nested models included, without validating them"""
+
+    return _plan(schema).read(obj)
+
+
+def build(schema: type[M], /, **fields) -> M:
+    """Response model of trusted service data, only constructed on the fast
+    path, which serializes whatever the fields hold"""
+
+    if settings.api.fast_json:
+        return schema.model_construct(**fields)
+    return schema.model_validate(fields, from_attributes=True)
+
+
+def dump_json(schema: type[BaseModel], content: Any) -> bytes:
+    """Serialize content as schema, with orjson on the fast path"""
+
+    if settings.api.fast_json:
+        return orjson.dumps(to_jsonable(schema, content), option=orjson.OPT_UTC_Z)
+    if not isinstance(content, BaseModel):
+        content = schema.model_validate(content, from_attributes=True)
+    return content.model_dump_json(by_alias=True).encode()
+
+
+def json_response(
+    schema: type[BaseModel],
+    content: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Mapping[str, str] | None = None,
+) -> Any:
+    """The fast path's JSON response, otherwise content as is for FastAPI to
+    validate against the route's response_model, which documents it either way"""
+
+    if not settings.api.fast_json:
+        return content
+    return Response(
+        dump_json(schema, content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -1,4 +1,5 @@
-__all__ = ("AnswerService", "QuestionService")
+__all__ = ("AnswerService", "ExportService", "QuestionService")
 
 from .answer_service import AnswerService
+from .export_service import ExportService
 from .question_service import QuestionService
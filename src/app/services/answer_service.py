@@ -1,57 +1,206 @@
+from collections.abc import Mapping
+
+from fastapi_pagination import Page, Params
+from fastapi_pagination.ext.sqlalchemy import apaginate
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import AnswerCreate
+from app.budget import query_budget
+from app.serialization import build
+from app.schemas import AnswerCreate, AnswerResponse, BulkItemError, CursorPage
 from core import Answer, Question
 from users import User
+from . import bulk
+from .cache import invalidate_question, invalidate_questions
+from .cursor import cursor_paginate
+from .projection import columns, to_models
+
+
+async def question_exists(question_id: int, session: AsyncSession) -> bool:
+    return bool(
+        await session.scalar(select(Question.id).where(Question.id == question_id))
+    )
 
 
 class AnswerService:
     @staticmethod
-    async def get_answer(answer_id: int, session: AsyncSession) -> type[Answer]:
+    @query_budget(statements=1, rows=1)
+    async def get_answer(answer_id: int, session: AsyncSession) -> AnswerResponse:
         """Get an answer by id"""
 
-        answer = await session.get(Answer, answer_id)
+        answer = (
+            await session.execute(
+                select(*columns(Answer, AnswerResponse)).where(Answer.id == answer_id)
+            )
+        ).first()
 
         if not answer:
             raise KeyError(f"Answer with id: {answer_id} not found")
 
-        return answer
+        return build(AnswerResponse, **answer._mapping)
 
     @staticmethod
+    @query_budget(statements=3, rows=100)
+    async def list_answers(
+        question_id: int, session: AsyncSession, params: Params | None = None
+    ) -> Page[AnswerResponse]:
+        """List a page of answers to a question, paginated by the database"""
+
+        query = (
+            select(*columns(Answer, AnswerResponse))
+            .where(Answer.question_id == question_id)
+            .order_by(Answer.created_at, Answer.id)
+        )
+        count_query = (
+            select(func.count())
+            .select_from(Answer)
+            .where(Answer.question_id == question_id)
+        )
+        page = await apaginate(
+            session,
+            query,
+            params,
+            count_query=count_query,
+            unwrap_mode="no-unwrap",
+            transformer=lambda rows: to_models(AnswerResponse, rows),
+        )
+
+        if not page.total and not await question_exists(question_id, session):
+            raise KeyError(f"Question with id: {question_id} not found")
+
+        return page
+
+    @staticmethod
+    @query_budget(statements=2, rows=101)
+    async def list_answers_cursor(
+        question_id: int, session: AsyncSession, cursor: str | None, size: int
+    ) -> CursorPage[AnswerResponse]:
+        """List answers to a question after the cursor, ordered by (created_at, id)"""
+
+        query = select(*columns(Answer, AnswerResponse)).where(
+            Answer.question_id == question_id
+        )
+        page = await cursor_paginate(
+            session, query, Answer, AnswerResponse, cursor, size
+        )
+
+        if not page.items and not await question_exists(question_id, session):
+            raise KeyError(f"Question with id: {question_id} not found")
+
+        return page
+
+    @staticmethod
+    @query_budget(statements=2, rows=1)
     async def create_answer(
         question_id: int, data: AnswerCreate, session: AsyncSession, user: User
     ) -> Answer:
-        """Create an answer by id"""
+        """Create an answer by id with a single INSERT ... RETURNING,
+        the question's counters are kept by a trigger"""
 
         if not user:
             raise ValueError("Unauthorized")
 
-        question = await session.get(Question, question_id)
-
-        if not question:
-            raise KeyError(f"Question with id: {question_id} not found")
+        try:
+            answer = await session.scalar(
+                insert(Answer)
+                .values(text=data.text, user_id=user.id, question_id=question_id)
+                .returning(Answer)
+            )
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            # Only the failure path pays for telling which foreign key failed
+            if not await question_exists(question_id, session):
+                raise KeyError(f"Question with id: {question_id} not found")
+            raise
 
-        answer = Answer(text=data.text, user_id=user.id, question_id=question_id)
-        session.add(answer)
-        await session.commit()
-        await session.refresh(answer)
+        await invalidate_question(question_id)
+        await invalidate_questions()
         return answer
 
     @staticmethod
+    @query_budget(
+        statements=2 * bulk.MAX_BULK_CHUNKS,
+        round_trips=bulk.MAX_BULK_INSERT_ROUND_TRIPS + bulk.MAX_BULK_CHUNKS,
+        rows=bulk.BULK_CHUNK_SIZE,
+    )
+    async def create_answers(
+        question_id: int,
+        data: Mapping[int, AnswerCreate],
+        session: AsyncSession,
+        user: User,
+    ) -> tuple[list[Answer], list[BulkItemError]]:
+        """Create answers with one multi-row INSERT ... RETURNING per chunk,
+        reporting the items of the chunks that failed by their index in data"""
+
+        if not user:
+            raise ValueError("Unauthorized")
+
+        # Read once, a failed chunk's rollback expires the user too
+        user_id = user.id
+        answers, errors = [], []
+        try:
+            for chunk in bulk.chunked(list(data.items()), bulk.BULK_CHUNK_SIZE):
+                try:
+                    created = (
+                        await session.scalars(
+                            insert(Answer).returning(
+                                Answer, sort_by_parameter_order=True
+                            ),
+                            [
+                                {
+                                    "text": item.text,
+                                    "user_id": user_id,
+                                    "question_id": question_id,
+                                }
+                                for _, item in chunk
+                            ],
+                        )
+                    ).all()
+                    await session.commit()
+                except DBAPIError:
+                    # Earlier chunks are committed, the client retries this one
+                    await session.rollback()
+                    if not answers and not await question_exists(question_id, session):
+                        raise KeyError(f"Question with id: {question_id} not found")
+                    errors.extend(bulk.not_stored(index for index, _ in chunk))
+                    continue
+                # Detached, a later chunk's rollback would expire them
+                for item in created:
+                    session.expunge(item)
+                answers.extend(created)
+        finally:
+            if answers:
+                await invalidate_question(question_id)
+                await invalidate_questions()
+        return answers, errors
+
+    @staticmethod
+    @query_budget(statements=2, rows=1)
     async def delete_answer(
         answer_id: int,
         session: AsyncSession,
         user: User,
     ) -> None:
-        """Delete an answer by id"""
+        """Delete an answer by id with a single DELETE ... RETURNING,
+        the question's counters are kept by a trigger"""
 
-        answer = await session.get(Answer, answer_id)
+        question_id = await session.scalar(
+            delete(Answer)
+            .where(Answer.id == answer_id, Answer.user_id == user.id)
+            .returning(Answer.question_id)
+        )
 
-        if not answer:
-            raise KeyError(f"Answer with id: {answer_id} not found")
-        if answer.user_id != user.id:
+        if question_id is None:
+            # Only the failure path pays for telling 404 from 403
+            if not await session.scalar(
+                select(Answer.id).where(Answer.id == answer_id)
+            ):
+                raise KeyError(f"Answer with id: {answer_id} not found")
             raise AssertionError("You can delete only your own answers")
 
-        await session.delete(answer)
         await session.commit()
+        await invalidate_question(question_id)
+        await invalidate_questions()
         return None
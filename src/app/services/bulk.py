@@ -0,0 +1,58 @@
+from collections.abc import Iterable, Iterator, Sequence
+from math import ceil
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.schemas import BulkItemError
+
+# Rows per multi-row INSERT, each chunk is committed on its own
+BULK_CHUNK_SIZE = 1000
+MAX_BULK_ITEMS = 10000
+MAX_BULK_CHUNKS = ceil(MAX_BULK_ITEMS / BULK_CHUNK_SIZE)
+# Drivers that can't batch INSERT ... RETURNING in order send a row per trip
+MAX_BULK_INSERT_ROUND_TRIPS = MAX_BULK_ITEMS + 2 * MAX_BULK_CHUNKS
+
+# Reported for every item of a chunk the database failed to insert
+NOT_STORED_ERROR = {
+    "type": "not_stored",
+    "loc": [],
+    "msg": "Not stored, inserting its chunk failed, it can be sent again",
+}
+
+M = TypeVar("M", bound=BaseModel)
+T = TypeVar("T")
+
+
+def validate_items(
+    schema: type[M], items: Sequence[Any]
+) -> tuple[dict[int, M], list[BulkItemError]]:
+    """Validate every item on its own, keeping the valid ones and collecting
+    the errors by item index"""
+
+    valid, errors = {}, []
+    for index, item in enumerate(items):
+        try:
+            valid[index] = schema.model_validate(item)
+        except ValidationError as e:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    errors=e.errors(include_url=False, include_context=False),
+                )
+            )
+    return valid, errors
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+def not_stored(indexes: Iterable[int]) -> list[BulkItemError]:
+    return [BulkItemError(index=index, errors=[NOT_STORED_ERROR]) for index in indexes]
+
+
+def merge_errors(*errors: list[BulkItemError]) -> list[BulkItemError]:
+    return sorted((error for group in errors for error in group), key=lambda e: e.index)
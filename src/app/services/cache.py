@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import blake2b
+
+from core import cache
+
+QUESTIONS_KEY = "questions"
+
+
+def question_key(question_id: int) -> str:
+    return f"question:{question_id}"
+
+
+@dataclass(frozen=True)
+class Version:
+    """Cheaply computed identity of a resource's current state"""
+
+    tag: str
+    last_modified: datetime | None
+
+    @classmethod
+    def of(cls, last_modified: datetime | None, *parts) -> "Version":
+        return cls(
+            blake2b(repr(parts).encode(), digest_size=12).hexdigest(), last_modified
+        )
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """Serialized JSON response with the version it was built for"""
+
+    version: Version
+    payload: bytes
+
+    def pack(self) -> bytes:
+        last_modified = self.version.last_modified
+        header = (
+            f"{self.version.tag} {last_modified.isoformat() if last_modified else ''}"
+        )
+        return f"{header}\n".encode() + self.payload
+
+    @classmethod
+    def unpack(cls, value: bytes) -> "CachedPayload":
+        header, payload = value.split(b"\n", 1)
+        tag, last_modified = header.decode().split(" ")
+        return cls(
+            Version(
+                tag, datetime.fromisoformat(last_modified) if last_modified else None
+            ),
+            payload,
+        )
+
+
+async def get_cached(key: str, field: str) -> CachedPayload | None:
+    value = await cache.get(key, field)
+    return None if value is None else CachedPayload.unpack(value)
+
+
+async def set_cached(key: str, field: str, entry: CachedPayload) -> None:
+    await cache.set(key, field, entry.pack())
+
+
+async def invalidate_questions() -> None:
+    """Drop every cached page of the questions listing"""
+
+    await cache.delete(QUESTIONS_KEY)
+
+
+async def invalidate_question(question_id: int) -> None:
+    """Drop every cached detail variant of a question"""
+
+    await cache.delete(question_key(question_id))
@@ -0,0 +1,62 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas import CursorPage
+from app.serialization import build
+from core import Base
+from .projection import to_models
+
+
+def encode_cursor(created_at: datetime, id_: int) -> str:
+    """Encode a (created_at, id) keyset position into an opaque token"""
+
+    raw = json.dumps([created_at.isoformat(), id_]).encode()
+    return urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a token made by encode_cursor"""
+
+    try:
+        created_at, id_ = json.loads(urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(id_)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor value") from e
+
+
+async def cursor_paginate(
+    session: AsyncSession,
+    query: Select,
+    model: type[Base],
+    schema: type[BaseModel],
+    cursor: str | None,
+    size: int,
+) -> CursorPage:
+    """Get a page of rows ordered by (created_at, id) after the given cursor,
+    query selects the columns of schema.
+
+    One extra row is fetched to tell whether a next page exists,
+    so no COUNT query is needed.
+    """
+
+    order = (model.created_at, model.id)
+    if cursor is not None:
+        query = query.where(tuple_(*order) > tuple_(*decode_cursor(cursor)))
+
+    rows = (await session.execute(query.order_by(*order).limit(size + 1))).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        last = rows[size - 1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return build(
+        CursorPage[schema],
+        items=to_models(schema, rows[:size]),
+        next_cursor=next_cursor,
+    )
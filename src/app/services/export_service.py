@@ -0,0 +1,120 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.budget import query_budget
+from app.schemas import AnswerResponse, QuestionDetail
+from core import Answer, Question
+
+# Rows fetched from the server-side cursor at a time
+EXPORT_BATCH_SIZE = 1000
+# Bytes collected before a chunk is written out
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+CSV_COLUMNS = (
+    "question_id",
+    "question_text",
+    "question_created_at",
+    "answer_id",
+    "answer_text",
+    "answer_user_id",
+    "answer_created_at",
+)
+
+
+class ExportService:
+    @staticmethod
+    @query_budget(statements=1)
+    async def stream_questions(
+        session: AsyncSession,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> AsyncIterator[QuestionDetail]:
+        """Stream questions created in [created_after, created_before)
+        with all their answers, holding one question in memory at a time"""
+
+        query = (
+            select(
+                Question.id,
+                Question.text,
+                Question.created_at,
+                Question.answer_count,
+                Question.last_answer_at,
+                Answer.id,
+                Answer.text,
+                Answer.user_id,
+                Answer.created_at,
+            )
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .order_by(Question.created_at, Question.id, Answer.created_at, Answer.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        if created_after is not None:
+            query = query.where(Question.created_at >= created_after)
+        if created_before is not None:
+            query = query.where(Question.created_at < created_before)
+
+        question = None
+        async for row in await session.stream(query):
+            q_id, q_text, q_created_at, answer_count, last_answer_at, *answer = row
+            a_id, a_text, a_user_id, a_created_at = answer
+            if question is None or question.id != q_id:
+                if question is not None:
+                    yield question
+                question = QuestionDetail(
+                    id=q_id,
+                    text=q_text,
+                    created_at=q_created_at,
+                    answer_count=answer_count,
+                    last_answer_at=last_answer_at,
+                )
+            if a_id is not None:
+                question.answers.append(
+                    AnswerResponse(
+                        id=a_id,
+                        question_id=q_id,
+                        user_id=a_user_id,
+                        text=a_text,
+                        created_at=a_created_at,
+                    )
+                )
+
+        if question is not None:
+            yield question
+
+    @staticmethod
+    async def to_ndjson(questions: AsyncIterator[QuestionDetail]) -> AsyncIterator[str]:
+        """One JSON document per question, shaped like GET /api/questions/{id}"""
+
+        buffer = io.StringIO()
+        async for question in questions:
+            buffer.write(question.model_dump_json())
+            buffer.write("\n")
+            if buffer.tell() >= EXPORT_BUFFER_SIZE:
+                yield buffer.getvalue()
+                buffer = io.StringIO()
+        yield buffer.getvalue()
+
+    @staticmethod
+    async def to_csv(questions: AsyncIterator[QuestionDetail]) -> AsyncIterator[str]:
+        """One row per answer, questions without answers get empty answer columns"""
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        async for question in questions:
+            prefix = (question.id, question.text, question.created_at.isoformat())
+            answers = [
+                (answer.id, answer.text, answer.user_id, answer.created_at.isoformat())
+                for answer in question.answers
+            ] or [("", "", "", "")]
+            writer.writerows(prefix + answer for answer in answers)
+            if buffer.tell() >= EXPORT_BUFFER_SIZE:
+                yield buffer.getvalue()
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+        yield buffer.getvalue()
@@ -0,0 +1,35 @@
+from collections.abc import Iterable
+from functools import cache
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row
+from sqlalchemy.orm import InstrumentedAttribute
+
+from core import Base, settings
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def columns(entity: type[Base], schema: type[BaseModel]) -> list[InstrumentedAttribute]:
+    """Columns of entity shown by schema, in its field order. Read paths select
+    them rather than hydrating whole entities into the session"""
+
+    return [getattr(entity, name) for name in schema.model_fields]
+
+
+@cache
+def _list_adapter(schema: type[M]) -> TypeAdapter[list[M]]:
+    return TypeAdapter(list[schema])
+
+
+def to_models(schema: type[M], rows: Iterable[Row]) -> list[M] | list[dict[str, Any]]:
+    """Response models of rows selected with columns(), validated in a single
+    call, cheaper than even constructing them one by one. The fast path trusts
+    the rows and keeps them as dicts, which dump_json reads as well"""
+
+    fields = list(schema.model_fields)
+    items = [dict(zip(fields, row)) for row in rows]
+    if settings.api.fast_json:
+        return items
+    return _list_adapter(schema).validate_python(items)
@@ -1,50 +1,300 @@
-from collections.abc import Sequence
+from collections.abc import Mapping
 
-from sqlalchemy import select
+from fastapi_pagination import Page, Params
+from fastapi_pagination.ext.sqlalchemy import apaginate
+from sqlalchemy import delete, func, insert, literal_column, or_, select
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import QuestionCreate
-from core import Question
+from app.budget import query_budget
+from app.schemas import (
+    AnswerResponse,
+    BulkItemError,
+    CursorPage,
+    QuestionCreate,
+    QuestionDetail,
+    QuestionFilters,
+    QuestionResponse,
+)
+from app.serialization import build
+from core import Answer, Deletion, Question
+from core.search import search_matches, search_rank
+from . import bulk
+from .cache import Version, invalidate_question, invalidate_questions
+from .cursor import cursor_paginate
+from .projection import columns, to_models
+
+SORT_COLUMNS = {
+    "created_at": Question.created_at,
+    "answer_count": Question.answer_count,
+    "last_answer_at": Question.last_answer_at,
+}
+
+
+def filter_questions(filters: QuestionFilters) -> list:
+    """WHERE conditions of the listing, phrased so that one index serves
+    both the filters and the order"""
+
+    conditions = []
+    if filters.created_after is not None or filters.created_before is not None:
+        if filters.sort != "created_at":
+            raise ValueError("created_after and created_before need sort=created_at")
+        if filters.created_after is not None:
+            conditions.append(Question.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            conditions.append(Question.created_at < filters.created_before)
+
+    if filters.has_answers is True:
+        # A question has answers exactly when it has a last answer, which
+        # leaves the sort index to serve the order
+        conditions.append(
+            Question.answer_count > literal_column("0")
+            if filters.sort == "answer_count"
+            else Question.last_answer_at.is_not(None)
+        )
+    elif filters.has_answers is False:
+        # A literal, not a parameter, to match the partial index predicate
+        conditions.append(
+            Question.last_answer_at.is_(None)
+            if filters.sort == "last_answer_at"
+            else Question.answer_count == literal_column("0")
+        )
+    return conditions
 
 
 class QuestionService:
     @staticmethod
-    async def list_questions(session: AsyncSession) -> Sequence[Question]:
-        """List all questions"""
+    @query_budget(statements=2, rows=100)
+    async def list_questions(
+        session: AsyncSession,
+        params: Params | None = None,
+        filters: QuestionFilters | None = None,
+    ) -> Page[QuestionResponse]:
+        """List a filtered page of questions, paginated by the database"""
+
+        filters = filters or QuestionFilters()
+        conditions = filter_questions(filters)
+        # id breaks ties in the same direction, so one index serves the order
+        sort_columns = (
+            (Question.id,)
+            if filters.sort == "id"
+            else (SORT_COLUMNS[filters.sort], Question.id)
+        )
+        order = [
+            column.desc() if filters.direction == "desc" else column
+            for column in sort_columns
+        ]
+        query = (
+            select(*columns(Question, QuestionResponse))
+            .where(*conditions)
+            .order_by(*order)
+        )
+        count_query = select(func.count()).select_from(Question).where(*conditions)
+        return await apaginate(
+            session,
+            query,
+            params,
+            count_query=count_query,
+            unwrap_mode="no-unwrap",
+            transformer=lambda rows: to_models(QuestionResponse, rows),
+        )
+
+    @staticmethod
+    @query_budget(statements=2, rows=100)
+    async def search_questions(
+        session: AsyncSession,
+        q: str,
+        include_answers: bool = False,
+        params: Params | None = None,
+    ) -> Page[QuestionResponse]:
+        """Search questions by text, optionally by their answers' text too,
+        the most relevant first"""
+
+        match = search_matches(Question.search_vector, q)
+        rank = search_rank(Question.search_vector, q)
+        if include_answers:
+            answer_match = search_matches(Answer.search_vector, q)
+            best_answer_rank = (
+                select(func.max(search_rank(Answer.search_vector, q)))
+                .where(Answer.question_id == Question.id, answer_match)
+                .scalar_subquery()
+            )
+            match = or_(
+                match, Question.id.in_(select(Answer.question_id).where(answer_match))
+            )
+            rank = rank + func.coalesce(best_answer_rank, 0)
+
+        query = (
+            select(*columns(Question, QuestionResponse))
+            .where(match)
+            .order_by(rank.desc(), Question.id)
+        )
+        count_query = select(func.count()).select_from(Question).where(match)
+        return await apaginate(
+            session,
+            query,
+            params,
+            count_query=count_query,
+            unwrap_mode="no-unwrap",
+            transformer=lambda rows: to_models(QuestionResponse, rows),
+        )
+
+    @staticmethod
+    @query_budget(statements=1, rows=1)
+    async def get_questions_version(session: AsyncSession) -> Version:
+        """Get the version of the questions listing from the last ids of the
+        questions, the answers counted in it and the deletions log, and the
+        maxima its Last-Modified comes from.
+
+        Ids are taken in insert order, not in commit order, so a write
+        committing after one with a greater id goes unnoticed until the next"""
+
+        # One subquery per maximum, each read off the end of an index
+        last_id, last_answer_id, last_deletion_id, last_created_at, last_answer_at = (
+            await session.execute(
+                select(
+                    select(func.max(Question.id)).scalar_subquery(),
+                    select(func.max(Answer.id)).scalar_subquery(),
+                    select(func.max(Deletion.id)).scalar_subquery(),
+                    select(func.max(Question.created_at)).scalar_subquery(),
+                    select(func.max(Question.last_answer_at)).scalar_subquery(),
+                )
+            )
+        ).one()
+        last_modified = max(
+            filter(None, (last_created_at, last_answer_at)), default=None
+        )
+        return Version.of(last_modified, last_id, last_answer_id, last_deletion_id)
+
+    @staticmethod
+    @query_budget(statements=1, rows=101)
+    async def list_questions_cursor(
+        session: AsyncSession, cursor: str | None, size: int
+    ) -> CursorPage[QuestionResponse]:
+        """List questions after the cursor, ordered by (created_at, id)"""
 
-        questions = await session.execute(select(Question))
-        return questions.scalars().all()
+        query = select(*columns(Question, QuestionResponse))
+        return await cursor_paginate(
+            session, query, Question, QuestionResponse, cursor, size
+        )
 
     @staticmethod
-    async def get_question(question_id: int, session: AsyncSession) -> type[Question]:
-        """Get a question by id"""
+    @query_budget(statements=2, rows=100)
+    async def get_question(
+        question_id: int, session: AsyncSession, answers_limit: int = 50
+    ) -> QuestionDetail:
+        """Get a question by id with its first answers"""
 
-        question = await session.get(Question, question_id)
+        question = (
+            await session.execute(
+                select(*columns(Question, QuestionResponse)).where(
+                    Question.id == question_id
+                )
+            )
+        ).first()
 
         if not question:
             raise KeyError(f"Question with id: {question_id} not found")
 
-        return question
+        answers = []
+        if answers_limit and question.answer_count:
+            answers = to_models(
+                AnswerResponse,
+                await session.execute(
+                    select(*columns(Answer, AnswerResponse))
+                    .where(Answer.question_id == question_id)
+                    .order_by(Answer.created_at, Answer.id)
+                    .limit(answers_limit)
+                ),
+            )
+
+        return build(QuestionDetail, **question._mapping, answers=answers)
+
+    @staticmethod
+    @query_budget(statements=1, rows=1)
+    async def get_question_version(question_id: int, session: AsyncSession) -> Version:
+        """Get the version of a question from its answer counters"""
+
+        row = (
+            await session.execute(
+                select(
+                    Question.created_at, Question.answer_count, Question.last_answer_at
+                ).where(Question.id == question_id)
+            )
+        ).first()
+
+        if not row:
+            raise KeyError(f"Question with id: {question_id} not found")
+
+        created_at, answer_count, last_answer_at = row
+        return Version.of(
+            last_answer_at or created_at, question_id, answer_count, last_answer_at
+        )
 
     @staticmethod
+    @query_budget(statements=1, rows=1)
     async def create_question(data: QuestionCreate, session: AsyncSession) -> Question:
-        """Create a new question"""
+        """Create a new question with a single INSERT ... RETURNING"""
 
-        question = Question(text=data.text)
-        session.add(question)
+        question = await session.scalar(
+            insert(Question).values(text=data.text).returning(Question)
+        )
         await session.commit()
-        await session.refresh(question)
+        await invalidate_questions()
         return question
 
     @staticmethod
+    @query_budget(
+        statements=bulk.MAX_BULK_CHUNKS,
+        round_trips=bulk.MAX_BULK_INSERT_ROUND_TRIPS,
+        rows=bulk.BULK_CHUNK_SIZE,
+    )
+    async def create_questions(
+        data: Mapping[int, QuestionCreate], session: AsyncSession
+    ) -> tuple[list[Question], list[BulkItemError]]:
+        """Create questions with one multi-row INSERT ... RETURNING per chunk,
+        reporting the items of the chunks that failed by their index in data"""
+
+        questions, errors = [], []
+        try:
+            for chunk in bulk.chunked(list(data.items()), bulk.BULK_CHUNK_SIZE):
+                try:
+                    created = (
+                        await session.scalars(
+                            insert(Question).returning(
+                                Question, sort_by_parameter_order=True
+                            ),
+                            [{"text": item.text} for _, item in chunk],
+                        )
+                    ).all()
+                    await session.commit()
+                except DBAPIError:
+                    # Earlier chunks are committed, the client retries this one
+                    await session.rollback()
+                    errors.extend(bulk.not_stored(index for index, _ in chunk))
+                    continue
+                # Detached, a later chunk's rollback would expire them
+                for item in created:
+                    session.expunge(item)
+                questions.extend(created)
+        finally:
+            if questions:
+                await invalidate_questions()
+        return questions, errors
+
+    @staticmethod
+    @query_budget(statements=1, rows=1)
     async def delete_question(question_id: int, session: AsyncSession) -> None:
-        """Delete a question by id"""
+        """Delete a question by id, its answers go with ON DELETE CASCADE"""
 
-        question = await session.get(Question, question_id)
+        deleted_id = await session.scalar(
+            delete(Question).where(Question.id == question_id).returning(Question.id)
+        )
 
-        if not question:
+        if deleted_id is None:
             raise KeyError(f"Question with id: {question_id} not found")
 
-        await session.delete(question)
         await session.commit()
+        await invalidate_question(question_id)
+        await invalidate_questions()
         return None
@@ -0,0 +1,17 @@
+__all__ = (
+    "DATASETS",
+    "ENDPOINTS",
+    "Dataset",
+    "Endpoint",
+    "benchmark_projection",
+    "benchmark_serialization",
+    "run_benchmark",
+    "seed",
+)
+
+
+from .datasets import DATASETS, Dataset
+from .driver import ENDPOINTS, Endpoint, run_benchmark
+from .projection import benchmark_projection
+from .seed import seed
+from .serialization import benchmark_serialization
@@ -0,0 +1,198 @@
+import argparse
+import asyncio
+import json
+import logging
+import subprocess
+import sys
+from datetime import UTC, datetime
+from typing import TextIO
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core import get_logger, setup_logging
+from core.config import DBSettings
+from .datasets import DATASETS, Dataset
+from .driver import in_process_client, run_benchmark, uvicorn_client
+from .projection import benchmark_projection
+from .seed import seed
+from .serialization import benchmark_serialization
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_URL = "sqlite+aiosqlite:///benchmark.db"
+# Relative increase of p95 latency that fails compare
+DEFAULT_THRESHOLD = 0.1
+# Queries per request vary a little with cache hits, half a query more fails compare
+QUERIES_TOLERANCE = 0.5
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Seed a dataset and benchmark the API against it"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, description in (
+        ("seed", "Recreate the schema and seed the dataset, the database is wiped"),
+        ("run", "Benchmark every endpoint and write the results as JSON"),
+    ):
+        command = commands.add_parser(name, help=description)
+        command.add_argument(
+            "--db-url",
+            default=DEFAULT_DB_URL,
+            help=f"SQLite file or PostgreSQL database, {DEFAULT_DB_URL} by default",
+        )
+        command.add_argument("--dataset", choices=DATASETS, default="10k")
+        command.add_argument("--questions", type=int)
+        command.add_argument("--answers", type=int)
+        command.add_argument("--users", type=int)
+        command.add_argument("--skew", type=float)
+        command.add_argument("--seed", type=int)
+
+    run = commands.choices["run"]
+    run.add_argument("--requests", type=int, default=1000, help="Per endpoint")
+    run.add_argument("--concurrency", type=int, default=10)
+    run.add_argument("--warmup", type=int, default=50, help="Per endpoint")
+    run.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Run that many uvicorn workers instead of calling the app in-process",
+    )
+    run.add_argument("--port", type=int, default=8765)
+    run.add_argument(
+        "--output", "-o", help="File to write to, standard output by default"
+    )
+
+    projection = commands.add_parser(
+        "projection",
+        help="Time loading seeded rows as entities against selecting their columns",
+    )
+    projection.add_argument("--db-url", default=DEFAULT_DB_URL)
+    projection.add_argument("--rows", type=int, default=100, help="Per page")
+    projection.add_argument("--repeat", type=int, default=100)
+
+    serialize = commands.add_parser(
+        "serialize",
+        help="Time validating and serializing a QuestionDetail against the fast path",
+    )
+    serialize.add_argument("--answers", type=int, default=1000)
+    serialize.add_argument("--repeat", type=int, default=200)
+
+    compare = commands.add_parser(
+        "compare", help="Compare two results, failing on regressions"
+    )
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    return parser.parse_args(argv)
+
+
+def dataset_from_args(args: argparse.Namespace) -> Dataset:
+    return DATASETS[args.dataset].with_overrides(
+        questions=args.questions,
+        answers=args.answers,
+        users=args.users,
+        skew=args.skew,
+        seed=args.seed,
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    dataset = dataset_from_args(args)
+    connect = (
+        uvicorn_client(args.db_url, args.workers, args.port, args.concurrency)
+        if args.workers
+        else in_process_client(args.db_url)
+    )
+    async with connect as client:
+        endpoints = await run_benchmark(
+            client, dataset, args.requests, args.concurrency, args.warmup
+        )
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "database": DBSettings(DB_URL=args.db_url).url.split(":", 1)[0],
+        "mode": f"uvicorn --workers {args.workers}" if args.workers else "asgi",
+        "dataset": dataset.as_dict(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "endpoints": endpoints,
+    }
+
+
+async def seed_database(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_url)
+    try:
+        await seed(engine, dataset_from_args(args))
+    finally:
+        await engine.dispose()
+
+
+def compare(baseline: dict, current: dict, threshold: float, output: TextIO) -> bool:
+    """Print how every endpoint changed, False when one regressed"""
+
+    passed = True
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            output.write(f"{name}: new\n")
+            continue
+
+        p95_change = now["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0
+        regressions = []
+        if p95_change > threshold:
+            regressions.append("p95")
+        before_queries = before["queries_per_request"] or 0
+        if (now["queries_per_request"] or 0) > before_queries + QUERIES_TOLERANCE:
+            regressions.append("queries")
+        passed = passed and not regressions
+
+        output.write(
+            f"{name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms ({p95_change:+.1%})"
+            f", {before['requests_per_second']} -> {now['requests_per_second']} req/s"
+            f", queries {before['queries_per_request']} -> {now['queries_per_request']}"
+            f"{'  REGRESSED: ' + ', '.join(regressions) if regressions else ''}\n"
+        )
+    return passed
+
+
+def main(argv: list[str] | None = None) -> None:
+    # Per-request logs of the app and httpx would be measured along with it
+    setup_logging(logging.WARNING)
+    logging.getLogger("benchmark").setLevel(logging.INFO)
+    args = parse_args(argv)
+
+    if args.command == "seed":
+        asyncio.run(seed_database(args))
+    elif args.command == "projection":
+        results = asyncio.run(benchmark_projection(args.db_url, args.rows, args.repeat))
+        print(json.dumps(results, indent=2))
+    elif args.command == "serialize":
+        print(json.dumps(benchmark_serialization(args.answers, args.repeat), indent=2))
+    elif args.command == "run":
+        results = json.dumps(asyncio.run(run(args)), indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output:
+                output.write(results)
+        else:
+            print(results)
+    else:
+        with open(args.baseline) as baseline, open(args.current) as current:
+            passed = compare(
+                json.load(baseline), json.load(current), args.threshold, sys.stdout
+            )
+        sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
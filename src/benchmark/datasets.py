@@ -0,0 +1,62 @@
+from bisect import bisect
+from dataclasses import asdict, dataclass, replace
+from itertools import accumulate
+from random import Random
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Volumes of a seeded dataset and how answers and reads spread over questions.
+
+    With skew 0 every question is equally likely, above 0 the question of
+    rank r gets a weight of 1 / r ** skew, so a few hot questions take most
+    of the answers and of the reads."""
+
+    name: str
+    questions: int
+    answers: int
+    users: int
+    skew: float = 0
+    seed: int = 0
+
+    def with_overrides(self, **overrides) -> "Dataset":
+        return replace(
+            self,
+            **{key: value for key, value in overrides.items() if value is not None},
+        )
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+DATASETS = {
+    dataset.name: dataset
+    for dataset in (
+        Dataset("10k", questions=10_000, answers=30_000, users=100),
+        Dataset("1m", questions=1_000_000, answers=3_000_000, users=10_000),
+        Dataset("hot", questions=10_000, answers=100_000, users=1_000, skew=1.2),
+    )
+}
+
+
+class QuestionPicker:
+    """Draws question ids following the dataset's distribution"""
+
+    def __init__(self, dataset: Dataset, rng: Random):
+        self.rng = rng
+        self.questions = dataset.questions
+        self.cum_weights = (
+            list(
+                accumulate(
+                    1 / rank**dataset.skew for rank in range(1, dataset.questions + 1)
+                )
+            )
+            if dataset.skew
+            else None
+        )
+
+    def __call__(self) -> int:
+        if self.cum_weights is None:
+            return self.rng.randint(1, self.questions)
+        point = self.rng.random() * self.cum_weights[-1]
+        return bisect(self.cum_weights, point) + 1
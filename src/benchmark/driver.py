@@ -0,0 +1,285 @@
+import asyncio
+import os
+import re
+import sys
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from math import ceil
+from pathlib import Path
+from random import Random
+from statistics import fmean
+from time import perf_counter
+
+from fastapi_pagination import add_pagination
+from httpx import ASGITransport, AsyncClient, Limits, TransportError
+
+from app.app import app
+from core import DBHelper, cache, db_helper, get_logger
+from core.config import DBSettings, settings
+from .datasets import Dataset, QuestionPicker
+from .seed import NOUNS, PASSWORD, phrase, user_email
+
+logger = get_logger(__name__)
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) statements"')
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """A request to benchmark, its url and body drawn from the dataset"""
+
+    name: str
+    method: str
+    url: Callable[[QuestionPicker, Random], str]
+    body: Callable[[Random], dict] | None = None
+    authenticated: bool = False
+
+
+ENDPOINTS = (
+    Endpoint(
+        "list_questions",
+        "GET",
+        lambda pick, rng: f"/api/questions/?page={rng.randint(1, 20)}&size=50",
+    ),
+    Endpoint(
+        "list_questions_by_answer_count",
+        "GET",
+        lambda pick, rng: "/api/questions/?sort=answer_count&direction=desc&size=50",
+    ),
+    Endpoint(
+        "list_unanswered_questions",
+        "GET",
+        lambda pick, rng: (
+            "/api/questions/?sort=created_at&direction=desc&has_answers=false&size=50"
+        ),
+    ),
+    Endpoint("list_questions_cursor", "GET", lambda pick, rng: "/api/questions/cursor"),
+    Endpoint("get_question", "GET", lambda pick, rng: f"/api/questions/{pick()}"),
+    Endpoint(
+        "list_answers",
+        "GET",
+        lambda pick, rng: f"/api/questions/{pick()}/answers?size=50",
+    ),
+    Endpoint(
+        "search_questions",
+        "GET",
+        lambda pick, rng: f"/api/questions/search?q={rng.choice(NOUNS)}",
+    ),
+    Endpoint(
+        "create_answer",
+        "POST",
+        lambda pick, rng: f"/api/questions/{pick()}/answers",
+        body=lambda rng: {"text": f"Try to {phrase(rng)}"},
+        authenticated=True,
+    ),
+)
+
+
+@dataclass
+class EndpointResult:
+    """Measurements of every request sent to one endpoint"""
+
+    seconds: float = 0
+    errors: int = 0
+    latencies: list[float] = field(default_factory=list)
+    statements: list[int] = field(default_factory=list)
+    db_seconds: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "requests_per_second": round(len(latencies) / self.seconds, 2),
+            "mean_ms": round(fmean(latencies) * 1000, 3),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "queries_per_request": (
+                round(fmean(self.statements), 2) if self.statements else None
+            ),
+            "db_ms_per_request": (
+                round(fmean(self.db_seconds) * 1000, 3) if self.db_seconds else None
+            ),
+        }
+
+
+def percentile(ordered: list[float], share: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+
+    return ordered[max(ceil(share * len(ordered)) - 1, 0)]
+
+
+async def drive(
+    client: AsyncClient,
+    endpoint: Endpoint,
+    requests: int,
+    concurrency: int,
+    pick: QuestionPicker,
+    rng: Random,
+    headers: dict[str, str],
+) -> EndpointResult:
+    """Send the requests from `concurrency` concurrent clients"""
+
+    # Drawn up front, so the draws don't depend on how requests interleave
+    calls = [
+        (endpoint.url(pick, rng), endpoint.body(rng) if endpoint.body else None)
+        for _ in range(requests)
+    ]
+    pending = iter(calls)
+    result = EndpointResult()
+
+    async def send_requests() -> None:
+        for url, body in pending:
+            start = perf_counter()
+            response = await client.request(
+                endpoint.method, url, json=body, headers=headers
+            )
+            result.latencies.append(perf_counter() - start)
+            if response.is_error:
+                result.errors += 1
+
+            # Set by the metrics middleware
+            match = SERVER_TIMING_DB.search(response.headers.get("Server-Timing", ""))
+            if match:
+                result.db_seconds.append(float(match[1]) / 1000)
+                result.statements.append(int(match[2]))
+
+    start = perf_counter()
+    await asyncio.gather(*(send_requests() for _ in range(concurrency)))
+    result.seconds = perf_counter() - start
+    return result
+
+
+async def log_in(client: AsyncClient) -> dict[str, str]:
+    """Authorization header of the first seeded user"""
+
+    response = await client.post(
+        f"{settings.auth_prefix}/login",
+        data={"username": user_email(0), "password": PASSWORD},
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_benchmark(
+    client: AsyncClient,
+    dataset: Dataset,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+    endpoints: tuple[Endpoint, ...] = ENDPOINTS,
+) -> dict[str, dict]:
+    """Benchmark the endpoints one after another, the same dataset
+    always gives the same requests"""
+
+    rng = Random(dataset.seed)
+    pick = QuestionPicker(dataset, rng)
+    auth_headers = await log_in(client)
+
+    results = {}
+    for endpoint in endpoints:
+        headers = auth_headers if endpoint.authenticated else {}
+        if warmup:
+            await drive(client, endpoint, warmup, concurrency, pick, rng, headers)
+        result = await drive(
+            client, endpoint, requests, concurrency, pick, rng, headers
+        )
+        results[endpoint.name] = result.summary()
+        logger.info(f"Benchmarked {endpoint.name}: {results[endpoint.name]}")
+    return results
+
+
+@asynccontextmanager
+async def in_process_client(db_url: str) -> AsyncGenerator[AsyncClient]:
+    """Client calling the app in this process through ASGITransport"""
+
+    db = DBSettings(DB_URL=db_url, echo=False)
+    helper = DBHelper(
+        url=db.url,
+        name="benchmark",
+        connect_args=db.connect_args,
+        **db.pool_kwargs,
+    )
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[db_helper.session_dependency] = helper.session_dependency
+    app.dependency_overrides[db_helper.read_session_dependency] = (
+        helper.read_session_dependency
+    )
+    # ASGITransport doesn't run the lifespan that would add it
+    add_pagination(app)
+    await cache.clear()
+    server_timing = settings.api.server_timing
+    settings.api.server_timing = True
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+            yield client
+    finally:
+        settings.api.server_timing = server_timing
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(overrides)
+        await helper.engine.dispose()
+
+
+@asynccontextmanager
+async def uvicorn_client(
+    db_url: str, workers: int, port: int, concurrency: int
+) -> AsyncGenerator[AsyncClient]:
+    """Client calling `workers` uvicorn worker processes over the loopback"""
+
+    env = {
+        **os.environ,
+        "DB_URL": db_url,
+        "ECHO": "false",
+        "WEB_CONCURRENCY": str(workers),
+        "API_SERVER_TIMING": "true",
+    }
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.app:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--no-access-log",
+        "--log-level",
+        "warning",
+        cwd=SRC_DIR,
+        env=env,
+    )
+    try:
+        async with AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            limits=Limits(max_connections=concurrency),
+            timeout=60,
+        ) as client:
+            await wait_until_ready(client, process)
+            yield client
+    finally:
+        if process.returncode is None:
+            process.terminate()
+        await process.wait()
+
+
+async def wait_until_ready(
+    client: AsyncClient, process: asyncio.subprocess.Process, timeout: float = 30
+) -> None:
+    deadline = perf_counter() + timeout
+    while perf_counter() < deadline:
+        if process.returncode is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if (await client.get("/metrics")).is_success:
+                return
+        except TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"uvicorn didn't start within {timeout} seconds")
@@ -0,0 +1,100 @@
+import tracemalloc
+from statistics import median
+from time import perf_counter
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.schemas import AnswerResponse, QuestionResponse
+from app.services.projection import columns, to_models
+from core import Answer, Base, Question
+
+# What listing and detail pages load, the entity and the schema of its rows
+SHAPES = {
+    "questions": (Question, QuestionResponse),
+    "answers": (Answer, AnswerResponse),
+}
+
+
+async def load_entities(
+    session: AsyncSession, entity: type[Base], schema: type[BaseModel], rows: int
+) -> list[BaseModel]:
+    """Hydrate whole entities and validate them, as read paths used to"""
+
+    items = (
+        await session.scalars(select(entity).order_by(entity.id).limit(rows))
+    ).all()
+    return [schema.model_validate(item, from_attributes=True) for item in items]
+
+
+async def load_columns(
+    session: AsyncSession, entity: type[Base], schema: type[BaseModel], rows: int
+) -> list[BaseModel]:
+    """Select the schema's columns straight into models, as read paths do"""
+
+    result = await session.execute(
+        select(*columns(entity, schema)).order_by(entity.id).limit(rows)
+    )
+    return to_models(schema, result)
+
+
+async def measure(
+    session_factory: async_sessionmaker, load, shape: str, rows: int, repeat: int
+) -> dict:
+    """Median microseconds and peak KiB allocated per loaded row"""
+
+    entity, schema = SHAPES[shape]
+    # Warm up statement compilation caches
+    async with session_factory() as session:
+        await load(session, entity, schema, rows)
+
+    timings = []
+    for _ in range(repeat):
+        async with session_factory() as session:
+            start = perf_counter()
+            loaded = len(await load(session, entity, schema, rows))
+            timings.append(perf_counter() - start)
+
+    # Traced on its own, tracing slows everything down
+    tracemalloc.start()
+    try:
+        async with session_factory() as session:
+            await load(session, entity, schema, rows)
+            peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "us_per_row": round(median(timings) * 1e6 / loaded, 2),
+        "kib_per_row": round(peak / 1024 / loaded, 3),
+    }
+
+
+async def benchmark_projection(db_url: str, rows: int = 100, repeat: int = 100) -> dict:
+    """Compare loading pages of seeded rows as entities and as columns"""
+
+    engine = create_async_engine(db_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    results = {}
+    try:
+        for shape in SHAPES:
+            entities = await measure(
+                session_factory, load_entities, shape, rows, repeat
+            )
+            projected = await measure(
+                session_factory, load_columns, shape, rows, repeat
+            )
+            results[shape] = {
+                "entities": entities,
+                "columns": projected,
+                "cpu_saved": round(
+                    1 - projected["us_per_row"] / entities["us_per_row"], 3
+                ),
+                "memory_saved": round(
+                    1 - projected["kib_per_row"] / entities["kib_per_row"], 3
+                ),
+            }
+    finally:
+        await engine.dispose()
+    return results
@@ -0,0 +1,127 @@
+from collections import Counter
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from itertools import batched
+from random import Random
+from uuid import UUID
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.services.bulk import BULK_CHUNK_SIZE
+from core import Answer, Base, Question, get_logger
+from users import User
+from users.password import password_helper
+from .datasets import Dataset, QuestionPicker
+
+logger = get_logger(__name__)
+
+PASSWORD = "benchmark"
+SEEDED_AT = datetime(2025, 1, 1, tzinfo=UTC)
+VERBS = ("cache", "index", "paginate", "stream", "validate", "migrate", "profile")
+NOUNS = ("query", "response", "session", "model", "token", "pool", "worker")
+TOOLS = ("FastAPI", "SQLAlchemy", "PostgreSQL", "pydantic", "uvicorn", "pytest")
+
+
+def user_email(index: int) -> str:
+    return f"user{index}@benchmark.example.com"
+
+
+def question_created_at(question_id: int) -> datetime:
+    return SEEDED_AT + timedelta(minutes=question_id)
+
+
+def answer_created_at(question_id: int, number: int) -> datetime:
+    """The answers of a question come one second after another"""
+
+    return question_created_at(question_id) + timedelta(seconds=number)
+
+
+def phrase(rng: Random) -> str:
+    return f"{rng.choice(VERBS)} the {rng.choice(NOUNS)} with {rng.choice(TOOLS)}"
+
+
+def user_rows(ids: list[UUID]) -> Iterator[dict]:
+    # Hashing is deliberately slow, every user shares one hash
+    hashed_password = password_helper.hash(PASSWORD)
+    for index, user_id in enumerate(ids):
+        yield {
+            "id": user_id,
+            "email": user_email(index),
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "is_superuser": False,
+            "is_verified": True,
+        }
+
+
+def question_rows(dataset: Dataset, rng: Random) -> Iterator[dict]:
+    # Their answer counters are kept by the triggers on answers
+    for question_id in range(1, dataset.questions + 1):
+        yield {
+            "id": question_id,
+            "text": f"How do I {phrase(rng)}? #{question_id}",
+            "created_at": question_created_at(question_id),
+        }
+
+
+def answer_rows(
+    dataset: Dataset, answer_counts: Counter, user_ids: list[UUID], rng: Random
+) -> Iterator[dict]:
+    answer_id = 0
+    for question_id in range(1, dataset.questions + 1):
+        for number in range(1, answer_counts[question_id] + 1):
+            answer_id += 1
+            yield {
+                "id": answer_id,
+                "text": f"Try to {phrase(rng)}",
+                "question_id": question_id,
+                "user_id": rng.choice(user_ids),
+                "created_at": answer_created_at(question_id, number),
+            }
+
+
+async def insert_rows(conn: AsyncConnection, table, rows: Iterator[dict]) -> None:
+    """Insert with one multi-row INSERT per chunk, each chunk committed on its own"""
+
+    inserted = 0
+    for chunk in batched(rows, BULK_CHUNK_SIZE):
+        await conn.execute(insert(table), list(chunk))
+        await conn.commit()
+        inserted += len(chunk)
+    logger.info(f"Seeded {inserted} rows into {table.name}")
+
+
+async def seed(engine: AsyncEngine, dataset: Dataset) -> None:
+    """Recreate the schema and fill it with the dataset, the same seed
+    always gives the same rows"""
+
+    logger.info(f"Seeding dataset {dataset}")
+    rng = Random(dataset.seed)
+    user_ids = [UUID(int=rng.getrandbits(128), version=4) for _ in range(dataset.users)]
+    pick = QuestionPicker(dataset, rng)
+    answer_counts = Counter(pick() for _ in range(dataset.answers))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with engine.connect() as conn:
+        await insert_rows(conn, User.__table__, user_rows(user_ids))
+        await insert_rows(conn, Question.__table__, question_rows(dataset, rng))
+        await insert_rows(
+            conn, Answer.__table__, answer_rows(dataset, answer_counts, user_ids, rng)
+        )
+
+        if conn.dialect.name == "postgresql":
+            # Ids were given explicitly, move the sequences past them
+            for table in ("questions", "answers"):
+                await conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'),"
+                        f" (SELECT coalesce(max(id), 1) FROM {table}))"
+                    )
+                )
+        # Planner statistics, as a long running database would have
+        await conn.execute(text("ANALYZE"))
+        await conn.commit()
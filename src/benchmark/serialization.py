@@ -0,0 +1,81 @@
+import json
+from datetime import UTC, datetime, timedelta
+from statistics import median
+from time import perf_counter
+from uuid import UUID
+
+from app.schemas import AnswerResponse, QuestionDetail
+from app.serialization import build, dump_json
+from app.services.projection import to_models
+from core import settings
+
+USER_ID = UUID("1f92cea0-9152-486d-aa29-e977c6c5c8cd")
+
+
+def make_question(answers: int) -> tuple[dict, list[tuple]]:
+    """A question's columns and its answer rows as get_question selects them,
+    without a database"""
+
+    created_at = datetime(2025, 11, 16, 12, 51, 27, 536294, tzinfo=UTC)
+    question = {
+        "id": 1,
+        "text": "What is FastAPI?",
+        "created_at": created_at,
+        "answer_count": answers,
+        "last_answer_at": created_at + timedelta(seconds=answers),
+    }
+    # In the field order of AnswerResponse, which columns() selects
+    return question, [
+        (
+            f"Answer number {i} to the question, long enough to be realistic",
+            i,
+            question["id"],
+            USER_ID,
+            created_at + timedelta(seconds=i, microseconds=i),
+        )
+        for i in range(1, answers + 1)
+    ]
+
+
+def serialize_detail(question: dict, rows: list[tuple]) -> bytes:
+    """Build and serialize a QuestionDetail from its rows the way the
+    get_question service and route do"""
+
+    detail = build(QuestionDetail, **question, answers=to_models(AnswerResponse, rows))
+    return dump_json(QuestionDetail, detail)
+
+
+def time_serialization(
+    question: dict, answers: list[tuple], repeat: int, fast: bool
+) -> tuple[float, bytes]:
+    """Median milliseconds to serialize the detail, with the fast path on or off"""
+
+    enabled = settings.api.fast_json
+    settings.api.fast_json = fast
+    try:
+        payload = serialize_detail(question, answers)
+        timings = []
+        for _ in range(repeat):
+            start = perf_counter()
+            serialize_detail(question, answers)
+            timings.append(perf_counter() - start)
+    finally:
+        settings.api.fast_json = enabled
+    return median(timings) * 1000, payload
+
+
+def benchmark_serialization(answers: int = 1000, repeat: int = 200) -> dict:
+    """Compare the validated and the fast serialization of a QuestionDetail"""
+
+    question, loaded = make_question(answers)
+    validated_ms, validated = time_serialization(question, loaded, repeat, False)
+    fast_ms, fast = time_serialization(question, loaded, repeat, True)
+    return {
+        "answers": answers,
+        "repeat": repeat,
+        "bytes": len(fast),
+        "identical": json.loads(fast) == json.loads(validated),
+        "validated_ms": round(validated_ms, 3),
+        "fast_ms": round(fast_ms, 3),
+        "speedup": round(validated_ms / fast_ms, 2),
+    }
@@ -1,9 +1,12 @@
 __all__ = (
     "Answer",
     "Base",
+    "CacheBackend",
     "DBHelper",
     "DBTextDateMixin",
+    "Deletion",
     "Question",
+    "cache",
     "db_helper",
     "get_logger",
     "settings",
@@ -11,7 +14,8 @@ __all__ = (
 )
 
 
-from core.models import Answer, Base, Question
+from core.models import Answer, Base, Deletion, Question
+from .cache import CacheBackend, cache
 from .config import settings
 from .db_helper import DBHelper, db_helper
 from .logger import setup_logging, get_logger
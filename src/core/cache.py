@@ -0,0 +1,151 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic
+
+from .config import CacheSettings, settings
+from .metrics import CACHE_EVICTIONS_TOTAL, CACHE_REQUESTS_TOTAL
+
+
+class CacheBackend(ABC):
+    """Cache of serialized payloads, stored as fields of a key,
+    so that deleting the key drops all its variants at once"""
+
+    name: str
+
+    async def get(self, key: str, field: str) -> bytes | None:
+        value = await self._get(key, field)
+        CACHE_REQUESTS_TOTAL.labels(self.name, "miss" if value is None else "hit").inc()
+        return value
+
+    @abstractmethod
+    async def _get(self, key: str, field: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, field: str, value: bytes) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class NullCache(CacheBackend):
+    """Cache that never stores anything"""
+
+    name = "none"
+
+    async def _get(self, key: str, field: str) -> bytes | None:
+        return None
+
+    async def set(self, key: str, field: str, value: bytes) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with a TTL, each worker has its own. Every field
+    expires and counts towards max_entries on its own, so that variants
+    neither outlive the TTL nor grow a key without bound"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000, ttl: int = 30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[float, bytes]] = OrderedDict()
+        self._fields: dict[str, set[str]] = {}
+
+    async def _get(self, key: str, field: str) -> bytes | None:
+        entry = self._entries.get((key, field))
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            self._discard(key, field)
+            return None
+
+        self._entries.move_to_end((key, field))
+        return value
+
+    async def set(self, key: str, field: str, value: bytes) -> None:
+        self._entries[(key, field)] = (monotonic() + self.ttl, value)
+        self._entries.move_to_end((key, field))
+        self._fields.setdefault(key, set()).add(field)
+
+        while len(self._entries) > self.max_entries:
+            (key, field), _ = self._entries.popitem(last=False)
+            self._discard(key, field)
+            CACHE_EVICTIONS_TOTAL.labels(self.name).inc()
+
+    def _discard(self, key: str, field: str) -> None:
+        self._entries.pop((key, field), None)
+        fields = self._fields.get(key)
+        if fields is not None:
+            fields.discard(field)
+            if not fields:
+                del self._fields[key]
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            for field in self._fields.pop(key, ()):
+                del self._entries[(key, field)]
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._fields.clear()
+
+
+class RedisCache(CacheBackend):
+    """Cache on a Redis-compatible server, shared by all workers. Fields expire
+    on their own with HEXPIRE, which needs Redis 7.4 or later"""
+
+    name = "redis"
+
+    def __init__(self, client, ttl: int = 30, prefix: str = "qa:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: int = 30) -> "RedisCache":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise ImportError("Redis cache backend requires the redis package") from e
+
+        return cls(Redis.from_url(url), ttl)
+
+    async def _get(self, key: str, field: str) -> bytes | None:
+        return await self.client.hget(self.prefix + key, field)
+
+    async def set(self, key: str, field: str, value: bytes) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(self.prefix + key, field, value)
+            pipe.hexpire(self.prefix + key, self.ttl, field)
+            await pipe.execute()
+
+    async def delete(self, *keys: str) -> None:
+        await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+def create_cache(cache_settings: CacheSettings) -> CacheBackend:
+    if cache_settings.backend == "redis":
+        return RedisCache.from_url(cache_settings.url, cache_settings.ttl)
+    if cache_settings.backend == "memory":
+        return MemoryCache(cache_settings.max_entries, cache_settings.ttl)
+    return NullCache()
+
+
+cache = create_cache(settings.cache)
@@ -1,4 +1,6 @@
-from pydantic_settings import BaseSettings
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class DBSettings(BaseSettings):
@@ -7,28 +9,118 @@ class DBSettings(BaseSettings):
     DB_NAME: str = "qa_dev"
     DB_HOST: str = "127.0.0.1"
     DB_PORT: int = 5432
+    # Full URL taking precedence over the parts above, e.g. sqlite+aiosqlite:///qa.db
+    DB_URL: str | None = None
     api_prefix: str = "/api/v1"
 
     echo: bool = True
 
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800  # seconds, -1 disables
+    pool_pre_ping: bool = True
+    statement_timeout: int = 30000  # milliseconds, 0 disables
+    statement_cache_size: int = 100  # asyncpg prepared statements, 0 disables
+    # Connections the database allows this app in total, when set every
+    # worker's pool_size + max_overflow is capped to its share of it
+    max_connections: int | None = None
+    web_concurrency: int = 1
+
+    # Read-only replicas for GET requests, e.g. REPLICA_URLS='["postgresql+asyncpg://..."]'
+    replica_urls: list[str] = []
+    # How long a client reads from the primary after its own write
+    replica_sticky_seconds: float = 5
+
     @property
     def url(self) -> str:
+        if self.DB_URL:
+            return self.DB_URL
         return (
             "postgresql+asyncpg://"
             f"{self.DB_USER}:{self.DB_PASSWORD}@"
             f"{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def pool_kwargs(self) -> dict:
+        pool_size, max_overflow = self.pool_size, self.max_overflow
+        if self.max_connections:
+            per_worker = max(self.max_connections // self.web_concurrency, 1)
+            pool_size = min(pool_size, per_worker)
+            max_overflow = min(max_overflow, per_worker - pool_size)
+
+        return {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
+    @property
+    def connect_args(self) -> dict:
+        if not self.url.startswith("postgresql+asyncpg"):
+            return {}
+        return {
+            "statement_cache_size": self.statement_cache_size,
+            "server_settings": {"statement_timeout": str(self.statement_timeout)},
+        }
+
 
 class JWTSettings(BaseSettings):
     lifetime_seconds: int = 604800  # week
     reset_password_token_secret: str = "reset_pwd_secret"
     verification_token_secret: str = "verification_secret"
 
+    # Keep users resolved from tokens in the cache for its ttl,
+    # updates through the user manager invalidate them
+    cache_users: bool = True
+    # Take is_active and the other flags from the signed token claims and skip
+    # the user lookup entirely. A deactivated user keeps access until expiry
+    trust_claims: bool = False
+
+
+class PasswordSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="PASSWORD_")
+
+    # argon2id work factor, changing it rehashes passwords on the next login
+    time_cost: int = 3
+    memory_cost: int = 65536  # KiB
+    parallelism: int = 4
+    bcrypt_rounds: int = 12  # only verifies legacy hashes
+    # Hashes computed at once per worker, keep it below the number of cores
+    max_concurrency: int = 2
+
+
+class CacheSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="CACHE_")
+
+    # "memory" is per worker, so gunicorn replaces it with "none" when it runs
+    # several, use "redis" to share the cache between workers
+    backend: Literal["memory", "redis", "none"] = "memory"
+    url: str = "redis://localhost:6379/0"  # Redis 7.4 or later
+    ttl: int = 30  # seconds
+    max_entries: int = 10000  # cached variants per worker with "memory"
+
+
+class APISettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="API_")
+
+    # Serialize responses with orjson straight from the service results,
+    # without validating them against the response models
+    fast_json: bool = False
+    # Report each request's database and total time in a Server-Timing header,
+    # only for trusted clients like the benchmark, as it exposes backend internals
+    server_timing: bool = False
+
 
 class Settings:
     db: DBSettings = DBSettings()
     jwt: JWTSettings = JWTSettings()
+    password: PasswordSettings = PasswordSettings()
+    cache: CacheSettings = CacheSettings()
+    api: APISettings = APISettings()
     auth_prefix: str = "/auth/jwt"
 
 
@@ -1,46 +1,148 @@
-from asyncio import current_task
+from collections.abc import Sequence
+from itertools import cycle
+from math import ceil
+from time import perf_counter, time
 from typing import AsyncGenerator
 
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
-    async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .config import settings
+from .metrics import observe_pool_wait, observe_statements, pool_collector
+
+PRIMARY_READS_COOKIE = "db_primary_until"
+
+
+class MeasuredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long every checkout waited for a connection"""
+
+    def connect(self):
+        start = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            observe_pool_wait(self.logging_name, perf_counter() - start)
 
 
 class DBHelper:
-    def __init__(self, url: str, echo: bool = False):
-        self.engine = create_async_engine(url=url, echo=echo)
-        self.session_factory = async_sessionmaker(
-            bind=self.engine,
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        name: str = "primary",
+        connect_args: dict | None = None,
+        replica_urls: Sequence[str] = (),
+        replica_sticky_seconds: float = 5,
+        **pool_kwargs,
+    ):
+        self.engine = self._create_engine(url, echo, name, connect_args, **pool_kwargs)
+        self.session_factory = self._create_session_factory(self.engine)
+
+        self.replica_engines = [
+            self._create_engine(
+                replica_url, echo, f"{name}_replica_{i}", connect_args, **pool_kwargs
+            )
+            for i, replica_url in enumerate(replica_urls)
+        ]
+        self.replica_session_factories = [
+            self._create_session_factory(engine) for engine in self.replica_engines
+        ]
+        self._replica_session_factories = cycle(self.replica_session_factories)
+        self.replica_sticky_seconds = replica_sticky_seconds
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        return [self.engine, *self.replica_engines]
+
+    async def dispose(self) -> None:
+        """Close the pooled connections of the primary and the replicas"""
+
+        for engine in self.engines:
+            await engine.dispose()
+
+    @staticmethod
+    def _create_engine(url, echo, name, connect_args, **pool_kwargs):
+        engine = create_async_engine(
+            url=url,
+            echo=echo,
+            poolclass=MeasuredQueuePool,
+            pool_logging_name=name,
+            connect_args=connect_args or {},
+            **pool_kwargs,
+        )
+        # QueuePool's default max_overflow
+        pool_collector.register(
+            name, engine.sync_engine, pool_kwargs.get("max_overflow", 10)
+        )
+        observe_statements(name, engine.sync_engine)
+        return engine
+
+    @staticmethod
+    def _create_session_factory(engine):
+        return async_sessionmaker(
+            bind=engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
 
-    def get_scoped_session(self):
-        return async_scoped_session(
-            session_factory=self.session_factory,
-            scopefunc=current_task,
-        )
-
     async def session_dependency(self) -> AsyncGenerator[AsyncSession]:
+        """Session on the primary, FastAPI caches it per request so the route
+        and the user dependencies share it and hold at most one connection"""
+
         async with self.session_factory() as session:
             yield session
-            await session.close()
 
-    async def scoped_session_dependency(
-        self,
-    ) -> AsyncGenerator[async_scoped_session[AsyncSession]]:
-        session = self.get_scoped_session()
-        yield session
-        await session.remove()
+    def stick_to_primary(self, response: Response) -> None:
+        """Make the client read from the primary for a while after its write"""
+
+        if self.replica_session_factories:
+            response.set_cookie(
+                PRIMARY_READS_COOKIE,
+                str(time() + self.replica_sticky_seconds),
+                max_age=ceil(self.replica_sticky_seconds),
+                httponly=True,
+            )
+
+    def sticks_to_primary(self, request: Request) -> bool:
+        """Whether the client is within the read-your-writes window of its write"""
+
+        if not self.replica_session_factories:
+            return False
+
+        try:
+            primary_until = float(request.cookies.get(PRIMARY_READS_COOKIE, 0))
+        except ValueError:
+            primary_until = 0
+        return primary_until > time()
+
+    def get_read_session_factory(self, request: Request) -> async_sessionmaker:
+        """Next replica in turn, or the primary without replicas or
+        within the read-your-writes window of the client"""
+
+        if not self.replica_session_factories or self.sticks_to_primary(request):
+            return self.session_factory
+
+        return next(self._replica_session_factories)
+
+    async def read_session_dependency(
+        self, request: Request
+    ) -> AsyncGenerator[AsyncSession]:
+        async with self.get_read_session_factory(request)() as session:
+            yield session
 
 
 db_helper = DBHelper(
     url=settings.db.url,
     echo=settings.db.echo,
+    connect_args=settings.db.connect_args,
+    replica_urls=settings.db.replica_urls,
+    replica_sticky_seconds=settings.db.replica_sticky_seconds,
+    **settings.db.pool_kwargs,
 )
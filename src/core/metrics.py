@@ -0,0 +1,191 @@
+import os
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import Engine, event
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+STATEMENT_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+DB_STATEMENT_DURATION_SECONDS = Histogram(
+    "db_statement_duration_seconds",
+    "Time to execute a statement and get its cursor back",
+    ["pool", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total", "Handled requests", ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests being handled",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+HTTP_REQUEST_DURATION_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time a request spent executing statements and waiting for connections",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "Statements executed by a request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+CACHE_REQUESTS_TOTAL = Counter(
+    "cache_requests_total", "Response cache lookups", ["backend", "result"]
+)
+CACHE_EVICTIONS_TOTAL = Counter(
+    "cache_evictions_total", "Entries evicted to stay within capacity", ["backend"]
+)
+
+
+@dataclass
+class RequestTimings:
+    """Database time spent by the request being handled"""
+
+    statements: int = 0
+    statement_seconds: float = 0
+    pool_wait_seconds: float = 0
+
+    @property
+    def db_seconds(self) -> float:
+        return self.statement_seconds + self.pool_wait_seconds
+
+
+# Set by the metrics middleware, engine and pool events add to it
+request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def observe_pool_wait(pool: str, seconds: float) -> None:
+    DB_POOL_CHECKOUT_SECONDS.labels(pool).observe(seconds)
+    timings = request_timings.get()
+    if timings is not None:
+        timings.pool_wait_seconds += seconds
+
+
+def observe_statements(name: str, engine: Engine) -> None:
+    """Time every statement the engine executes, per pool and per request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        context.metrics_started_at = perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def observe(conn, cursor, statement, parameters, context, executemany):
+        seconds = perf_counter() - context.metrics_started_at
+        operation = statement.lstrip().split(None, 1)[0].upper()
+        if operation not in STATEMENT_OPERATIONS:
+            operation = "OTHER"
+        DB_STATEMENT_DURATION_SECONDS.labels(name, operation).observe(seconds)
+
+        timings = request_timings.get()
+        if timings is not None:
+            timings.statements += 1
+            timings.statement_seconds += seconds
+
+
+class PoolCollector:
+    """Reports the pool state of registered engines on every scrape"""
+
+    def __init__(self):
+        self.engines: dict[str, tuple[Engine, int]] = {}
+
+    def register(self, name: str, engine: Engine, max_overflow: int = 10) -> None:
+        # The engine is kept rather than its pool, which dispose() replaces,
+        # with the max_overflow it was created with, pools don't expose it
+        self.engines[name] = (engine, max_overflow)
+
+    def collect(self):
+        size = GaugeMetricFamily(
+            "db_pool_size", "Persistent connections the pool keeps", labels=["pool"]
+        )
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out",
+            "Connections currently checked out of the pool",
+            labels=["pool"],
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow",
+            "Connections opened above pool_size",
+            labels=["pool"],
+        )
+        saturation = GaugeMetricFamily(
+            "db_pool_saturation",
+            "Checked out connections as a share of pool_size + max_overflow,"
+            " not reported for unbounded pools",
+            labels=["pool"],
+        )
+
+        for name, (engine, max_overflow) in self.engines.items():
+            pool = engine.pool
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+            # pool_size=0 or max_overflow=-1 lift the limit
+            if pool.size() > 0 and max_overflow >= 0:
+                capacity = pool.size() + max_overflow
+                saturation.add_metric([name], pool.checkedout() / capacity)
+
+        yield from (size, checked_out, overflow, saturation)
+
+
+pool_collector = PoolCollector()
+REGISTRY.register(pool_collector)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose, under gunicorn the metrics of all the workers
+    aggregated from PROMETHEUS_MULTIPROC_DIR"""
+
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    # Pool gauges are computed on scrape, these are of the worker answering
+    registry.register(pool_collector)
+    return registry
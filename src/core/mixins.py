@@ -1,14 +1,31 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Text
+from sqlalchemy import Computed, DateTime, Text, literal_column
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql.functions import now
 
+from .search import TSVectorType, search_document
+
+
+@compiles(now, "sqlite")
+def _sqlite_now(element, compiler, **kw) -> str:
+    """Render now() on SQLite in the same format SQLAlchemy binds datetimes,
+    so created_at values compare correctly (e.g. in keyset pagination)"""
+
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
 
 class DBTextDateMixin:
-    """Mixin for models with text and created_at fields"""
+    """Mixin for models with text and created_at fields,
+    and the full-text search document generated from text"""
 
     text: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=now()
     )
+    search_vector: Mapped[str] = mapped_column(
+        TSVectorType,
+        Computed(search_document(literal_column("text")), persisted=True),
+        deferred=True,
+    )
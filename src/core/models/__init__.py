@@ -1,5 +1,6 @@
-__all__ = ("Answer", "Base", "Question")
+__all__ = ("Answer", "Base", "Deletion", "Question")
 
 from .answer import Answer
 from .base import Base
+from .deletion import Deletion
 from .question import Question
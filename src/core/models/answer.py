@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, ForeignKey, Index, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.mixins import DBTextDateMixin
@@ -14,11 +14,119 @@ if TYPE_CHECKING:
 class Answer(DBTextDateMixin, Base):
     """Model representing an answer to a question"""
 
+    __table_args__ = (
+        # Leading question_id also serves plain lookups and ON DELETE CASCADE
+        Index(
+            "ix_answers_question_id_created_at_id", "question_id", "created_at", "id"
+        ),
+        Index("ix_answers_created_at_id", "created_at", "id"),
+        Index("ix_answers_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     question_id: Mapped[int] = mapped_column(
         ForeignKey("questions.id", ondelete="CASCADE")
     )
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), index=True
+    )
 
     question: Mapped["Question"] = relationship(
-        "Question", back_populates="answers", lazy="joined"
+        "Question", back_populates="answers", lazy="raise"
     )
+
+
+# Question.answer_count and last_answer_at are kept by triggers, so every
+# way answers go counts, ON DELETE CASCADE from their user included.
+# PostgreSQL counts each statement's rows at once from its transition table
+POSTGRESQL_COUNTER_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION count_added_answers() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE questions
+        SET answer_count = questions.answer_count + added.answer_count,
+            last_answer_at = greatest(questions.last_answer_at, added.last_answer_at)
+        FROM (
+            SELECT question_id,
+                   count(*) AS answer_count,
+                   max(created_at) AS last_answer_at
+            FROM added_answers
+            GROUP BY question_id
+        ) AS added
+        WHERE questions.id = added.question_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION count_deleted_answers() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        -- Locked as the insert trigger's UPDATE locks them, in id order.
+        -- Answers created concurrently either committed first, and the next
+        -- statement's snapshot sees them, or wait to count themselves after
+        PERFORM FROM questions
+        WHERE id IN (SELECT question_id FROM deleted_answers)
+        ORDER BY id
+        FOR NO KEY UPDATE;
+
+        UPDATE questions
+        SET answer_count = questions.answer_count - deleted.answer_count,
+            last_answer_at = (
+                SELECT max(created_at) FROM answers
+                WHERE answers.question_id = questions.id
+            )
+        FROM (
+            SELECT question_id, count(*) AS answer_count
+            FROM deleted_answers
+            GROUP BY question_id
+        ) AS deleted
+        WHERE questions.id = deleted.question_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER answers_count_added AFTER INSERT ON answers
+    REFERENCING NEW TABLE AS added_answers
+    FOR EACH STATEMENT EXECUTE FUNCTION count_added_answers()
+    """,
+    """
+    CREATE TRIGGER answers_count_deleted AFTER DELETE ON answers
+    REFERENCING OLD TABLE AS deleted_answers
+    FOR EACH STATEMENT EXECUTE FUNCTION count_deleted_answers()
+    """,
+)
+
+# SQLite has no statement triggers, nor concurrent writers to care about
+SQLITE_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER answers_count_added AFTER INSERT ON answers
+    BEGIN
+        UPDATE questions
+        SET answer_count = answer_count + 1,
+            last_answer_at = max(coalesce(last_answer_at, NEW.created_at), NEW.created_at)
+        WHERE id = NEW.question_id;
+    END
+    """,
+    """
+    CREATE TRIGGER answers_count_deleted AFTER DELETE ON answers
+    BEGIN
+        UPDATE questions
+        SET answer_count = answer_count - 1,
+            last_answer_at = (
+                SELECT max(created_at) FROM answers WHERE question_id = OLD.question_id
+            )
+        WHERE id = OLD.question_id;
+    END
+    """,
+)
+
+for dialect, statements in (
+    ("postgresql", POSTGRESQL_COUNTER_TRIGGERS),
+    ("sqlite", SQLITE_COUNTER_TRIGGERS),
+):
+    for statement in statements:
+        event.listen(
+            Answer.__table__, "after_create", DDL(statement).execute_if(dialect=dialect)
+        )
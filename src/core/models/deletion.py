@@ -0,0 +1,63 @@
+from sqlalchemy import DDL, event
+
+from .base import Base
+
+
+class Deletion(Base):
+    """Log of the statements deleting questions or answers, written by
+    triggers. Listing versions read its newest id, creates are told apart by
+    the newest ids of the rows themselves, so no write updates a shared row"""
+
+
+# Every statement deleting rows, ON DELETE CASCADE included, logs one new row.
+# Only the newest is read, older ones are pruned, skipping those concurrent
+# deletes are pruning
+POSTGRESQL_DELETION_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION log_deletion() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        logged_id integer;
+    BEGIN
+        IF NOT EXISTS (SELECT FROM deleted_rows) THEN
+            RETURN NULL;
+        END IF;
+        INSERT INTO deletions DEFAULT VALUES RETURNING id INTO logged_id;
+        DELETE FROM deletions
+        WHERE id IN (
+            SELECT id FROM deletions WHERE id < logged_id FOR UPDATE SKIP LOCKED
+        );
+        RETURN NULL;
+    END
+    $$
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_log_deleted AFTER DELETE ON {table}
+        REFERENCING OLD TABLE AS deleted_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION log_deletion()
+        """
+        for table in ("questions", "answers")
+    ),
+)
+
+SQLITE_DELETION_TRIGGERS = tuple(
+    f"""
+    CREATE TRIGGER {table}_log_deleted AFTER DELETE ON {table}
+    BEGIN
+        INSERT INTO deletions (id) VALUES (NULL);
+        DELETE FROM deletions WHERE id < (SELECT max(id) FROM deletions);
+    END
+    """
+    for table in ("questions", "answers")
+)
+
+# Once every table exists, the triggers are on other tables than this one
+for dialect, statements in (
+    ("postgresql", POSTGRESQL_DELETION_TRIGGERS),
+    ("sqlite", SQLITE_DELETION_TRIGGERS),
+):
+    for statement in statements:
+        event.listen(
+            Base.metadata, "after_create", DDL(statement).execute_if(dialect=dialect)
+        )
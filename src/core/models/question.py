@@ -1,6 +1,8 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.mixins import DBTextDateMixin
 from .base import Base
@@ -12,6 +14,29 @@ if TYPE_CHECKING:
 class Question(DBTextDateMixin, Base):
     """Model representing a question"""
 
+    __table_args__ = (
+        Index("ix_questions_created_at_id", "created_at", "id"),
+        Index("ix_questions_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_questions_answer_count_id", "answer_count", "id"),
+        Index("ix_questions_last_answer_at_id", "last_answer_at", "id"),
+        # Unanswered questions by creation time, answer_count leads so that
+        # the equality on it selects this index over the one above
+        Index(
+            "ix_questions_unanswered_created_at_id",
+            "answer_count",
+            "created_at",
+            "id",
+            postgresql_where=text("answer_count = 0"),
+            sqlite_where=text("answer_count = 0"),
+        ),
+    )
+
+    # Denormalized from answers, kept up to date by triggers on answers
+    answer_count: Mapped[int] = mapped_column(server_default="0")
+    last_answer_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    # Never loaded implicitly: queries that need answers must ask for them
+    # (e.g. with selectinload), and ON DELETE CASCADE removes them on delete.
     answers: Mapped[list["Answer"]] = relationship(
-        "Answer", back_populates="question", lazy="selectin"
+        "Answer", back_populates="question", lazy="raise", passive_deletes=True
     )
@@ -0,0 +1,73 @@
+from sqlalchemy import Boolean, Float, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+SEARCH_CONFIG = "english"
+
+# SQLite has no tsvector, it stores the lowercased text instead
+TSVectorType = TSVECTOR().with_variant(Text(), "sqlite")
+
+
+class search_document(FunctionElement):
+    """Searchable form of a text column: to_tsvector(text)"""
+
+    type = TSVectorType
+    inherit_cache = True
+
+
+class search_matches(FunctionElement):
+    """Whether a search document matches a web search style query"""
+
+    type = Boolean()
+    inherit_cache = True
+
+
+class search_rank(FunctionElement):
+    """Relevance of a search document to a query, 0 when it does not match"""
+
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(search_document)
+def _search_document(element, compiler, **kw) -> str:
+    (text,) = element.clauses
+    return f"to_tsvector('{SEARCH_CONFIG}', {compiler.process(text, **kw)})"
+
+
+@compiles(search_matches)
+def _search_matches(element, compiler, **kw) -> str:
+    document, query = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"{document} @@ websearch_to_tsquery('{SEARCH_CONFIG}', {query})"
+
+
+@compiles(search_rank)
+def _search_rank(element, compiler, **kw) -> str:
+    document, query = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"ts_rank_cd({document}, websearch_to_tsquery('{SEARCH_CONFIG}', {query}))"
+
+
+# Portable fallback for the SQLite test engine: case-insensitive substring search
+# ranked by the number of occurrences
+
+
+@compiles(search_document, "sqlite")
+def _sqlite_search_document(element, compiler, **kw) -> str:
+    (text,) = element.clauses
+    return f"lower({compiler.process(text, **kw)})"
+
+
+@compiles(search_matches, "sqlite")
+def _sqlite_search_matches(element, compiler, **kw) -> str:
+    document, query = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"instr({document}, lower({query})) > 0"
+
+
+@compiles(search_rank, "sqlite")
+def _sqlite_search_rank(element, compiler, **kw) -> str:
+    document, query = (compiler.process(clause, **kw) for clause in element.clauses)
+    return (
+        f"(length({document}) - length(replace({document}, lower({query}), '')))"
+        f" * 1.0 / length({query})"
+    )
@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import TextIO
+
+from app.services import ExportService
+from core import db_helper, get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export questions with their answers as NDJSON or CSV"
+    )
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--created-after", type=datetime.fromisoformat)
+    parser.add_argument("--created-before", type=datetime.fromisoformat)
+    parser.add_argument(
+        "--output", "-o", help="File to write to, standard output by default"
+    )
+    return parser.parse_args(argv)
+
+
+async def export(args: argparse.Namespace, output: TextIO) -> None:
+    async with db_helper.session_factory() as session:
+        questions = ExportService.stream_questions(
+            session, args.created_after, args.created_before
+        )
+        chunks = (
+            ExportService.to_csv(questions)
+            if args.format == "csv"
+            else ExportService.to_ndjson(questions)
+        )
+        async for chunk in chunks:
+            output.write(chunk)
+
+
+async def run(args: argparse.Namespace) -> None:
+    # Echoed SQL goes to stdout, where the data may be written
+    db_helper.engine.echo = False
+    try:
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as output:
+                await export(args, output)
+        else:
+            await export(args, sys.stdout)
+    finally:
+        await db_helper.engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    setup_logging()
+    args = parse_args(argv)
+    logger.info(f"Exporting questions as {args.format}")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Production server: gunicorn managing uvicorn workers.
+
+Every option can be overridden on the command line or in GUNICORN_CMD_ARGS,
+except the number of workers, which is only set with WEB_CONCURRENCY.
+"""
+
+import os
+import shutil
+import tempfile
+from math import ceil
+
+from uvicorn_worker import UvicornWorker
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+# Left to the lifespan shutdown to close the pools after requests are cancelled
+SHUTDOWN_MARGIN = 5
+
+
+def cpu_quota(
+    cpu_max: str = CGROUP_CPU_MAX,
+    v1_quota: str = CGROUP_V1_CPU_QUOTA,
+    v1_period: str = CGROUP_V1_CPU_PERIOD,
+) -> float | None:
+    """CPUs the container may use, None without a cgroup limit"""
+
+    try:
+        with open(cpu_max) as f:
+            quota, period = f.read().split()
+    except (OSError, ValueError):
+        try:
+            with open(v1_quota) as quota_file, open(v1_period) as period_file:
+                quota, period = quota_file.read().strip(), period_file.read().strip()
+        except OSError:
+            return None
+
+    if quota in ("max", "-1"):
+        return None
+    return int(quota) / int(period)
+
+
+def available_cpus(quota: float | None) -> int:
+    """CPUs this process may run on, within the container's CPU quota"""
+
+    cpus = os.process_cpu_count() or 1
+    if quota is not None:
+        cpus = min(cpus, max(ceil(quota), 1))
+    return cpus
+
+
+class Worker(UvicornWorker):
+    """Uvicorn worker on uvloop and httptools"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Cancel requests still running before gunicorn kills the worker,
+        # so the lifespan shutdown still closes the connection pools
+        self.config.timeout_graceful_shutdown = max(
+            self.cfg.graceful_timeout - SHUTDOWN_MARGIN, 1
+        )
+
+
+wsgi_app = "app.app:app"
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+
+# One asyncio worker per core keeps them all busy without contending for CPU
+workers = int(os.environ.get("WEB_CONCURRENCY") or available_cpus(cpu_quota()))
+# Read by the settings, so every worker's pool gets its share of max_connections
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = Worker
+
+# Writes only invalidate the in-process cache of the worker that made them,
+# the others would keep serving stale responses and users
+cache_disabled = workers > 1 and os.environ.get("CACHE_BACKEND", "memory") == "memory"
+if cache_disabled:
+    os.environ["CACHE_BACKEND"] = "none"
+# Heartbeat files on tmpfs, a disk-backed /tmp can block workers in containers
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Import the app once in the master, workers share its memory copy-on-write
+preload_app = True
+
+# Above the idle timeout of load balancers (60s by default on most), so they
+# never reuse a connection the worker is closing
+keepalive = 75
+# Connections queued while workers are busy, capped by net.core.somaxconn
+backlog = 4096
+
+# Recycle workers to bound slow memory growth, jittered so they don't all
+# restart at once
+max_requests = 10000
+max_requests_jitter = 1000
+
+# On SIGTERM workers stop accepting and drain in-flight requests for this long
+graceful_timeout = 30
+timeout = 60
+
+# Workers write their metrics here, GET /metrics aggregates them
+metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "qa-metrics")
+)
+# Files of a previous run would be counted again
+shutil.rmtree(metrics_dir, ignore_errors=True)
+os.makedirs(metrics_dir)
+
+
+def on_starting(server):
+    from core import setup_logging
+
+    setup_logging()
+    # --workers is only applied after this file sized the pools and picked
+    # the cache for `workers`, which each worker would then get wrong
+    if server.cfg.workers != workers:
+        raise RuntimeError(
+            f"{server.cfg.workers} workers set on the command line, the pools are"
+            f" sized for {workers}, set WEB_CONCURRENCY={server.cfg.workers} instead"
+        )
+    if cache_disabled:
+        server.log.warning(
+            "Response cache disabled, set CACHE_BACKEND=redis to share it"
+            " between %d workers",
+            workers,
+        )
+
+
+def post_fork(server, worker):
+    from core import db_helper
+
+    # Connections opened before the fork belong to the master, leave them
+    # alone and have the worker open its own
+    for engine in db_helper.engines:
+        engine.sync_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,12 +1,21 @@
-import uvicorn
+import argparse
+import sys
+from pathlib import Path
 
-from core import get_logger, setup_logging
+# Nothing here imports core before gunicorn.conf.py sets WEB_CONCURRENCY
+# and PROMETHEUS_MULTIPROC_DIR, the settings and metrics read them on import
+CONFIG_FILE = Path(__file__).with_name("gunicorn.conf.py")
 
-setup_logging()
-logger = get_logger(__name__)
 
+def run_reload() -> None:
+    """Single process restarting on code changes, for development"""
 
-def main() -> None:
+    import uvicorn
+
+    from core import get_logger, setup_logging
+
+    setup_logging()
+    get_logger(__name__).info("Starting main")
     uvicorn.run(
         "app.app:app",
         port=8000,
@@ -15,6 +24,31 @@ def main() -> None:
     )
 
 
+def serve(gunicorn_args: list[str]) -> None:
+    """Worker processes configured by gunicorn.conf.py, overridden by gunicorn_args"""
+
+    from gunicorn.app.wsgiapp import WSGIApplication
+
+    sys.argv = [sys.argv[0], "--config", str(CONFIG_FILE), *gunicorn_args]
+    WSGIApplication("%(prog)s [--reload] [GUNICORN OPTIONS]").run()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the API, other options are passed on to gunicorn"
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="single uvicorn process reloading on code changes, for development",
+    )
+    args, gunicorn_args = parser.parse_known_args()
+
+    if args.reload:
+        run_reload()
+    else:
+        serve(gunicorn_args)
+
+
 if __name__ == "__main__":
-    logger.info("Starting main")
     main()
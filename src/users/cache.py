@@ -0,0 +1,45 @@
+import json
+from uuid import UUID
+
+from core import cache
+from users.models import User
+
+USER_FIELD = "user"
+USER_CLAIMS = ("email", "is_active", "is_superuser", "is_verified")
+
+
+def user_key(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+def user_claims(user: User) -> dict:
+    """Fields of the user needed to authorize a request"""
+
+    return {claim: getattr(user, claim) for claim in USER_CLAIMS}
+
+
+def user_from_claims(user_id: UUID, claims: dict) -> User:
+    """Build a detached user from its claims, it is never added to a session"""
+
+    return User(
+        id=user_id,
+        hashed_password="",
+        **{claim: claims[claim] for claim in USER_CLAIMS},
+    )
+
+
+async def get_cached_user(user_id: UUID) -> User | None:
+    value = await cache.get(user_key(user_id), USER_FIELD)
+    return None if value is None else user_from_claims(user_id, json.loads(value))
+
+
+async def set_cached_user(user: User) -> None:
+    await cache.set(
+        user_key(user.id), USER_FIELD, json.dumps(user_claims(user)).encode()
+    )
+
+
+async def invalidate_user(user_id: UUID) -> None:
+    """Drop the cached user so the next request loads it again"""
+
+    await cache.delete(user_key(user_id))
@@ -1,11 +1,76 @@
 from os import getenv
+from uuid import UUID
 
+import jwt
+from fastapi_users import BaseUserManager, exceptions
 from fastapi_users.authentication import JWTStrategy
+from fastapi_users.jwt import decode_jwt, generate_jwt
 
 from core import settings
+from users.cache import (
+    USER_CLAIMS,
+    get_cached_user,
+    set_cached_user,
+    user_claims,
+    user_from_claims,
+)
+from users.models import User
 
 SECRET = getenv("JWT_SECRET", "secret")
 
 
-def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=SECRET, lifetime_seconds=settings.jwt.lifetime_seconds)
+class CachedJWTStrategy(JWTStrategy[User, UUID]):
+    """JWT strategy that resolves the user from the token claims or the cache
+    before falling back to the database"""
+
+    def __init__(
+        self, *args, cache_users: bool = True, trust_claims: bool = False, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.cache_users = cache_users
+        self.trust_claims = trust_claims
+
+    async def read_token(
+        self, token: str | None, user_manager: BaseUserManager[User, UUID]
+    ) -> User | None:
+        if token is None:
+            return None
+
+        try:
+            data = decode_jwt(
+                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+            )
+            user_id = user_manager.parse_id(data["sub"])
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            return None
+
+        # Tokens issued before the claims were added still go to the database
+        if self.trust_claims and all(claim in data for claim in USER_CLAIMS):
+            return user_from_claims(user_id, data)
+
+        if self.cache_users and (user := await get_cached_user(user_id)):
+            return user
+
+        try:
+            user = await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
+
+        if self.cache_users:
+            await set_cached_user(user)
+        return user
+
+    async def write_token(self, user: User) -> str:
+        data = {"sub": str(user.id), "aud": self.token_audience, **user_claims(user)}
+        return generate_jwt(
+            data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm
+        )
+
+
+def get_jwt_strategy() -> CachedJWTStrategy:
+    return CachedJWTStrategy(
+        secret=SECRET,
+        lifetime_seconds=settings.jwt.lifetime_seconds,
+        cache_users=settings.jwt.cache_users,
+        trust_claims=settings.jwt.trust_claims,
+    )
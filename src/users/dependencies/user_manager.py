@@ -1,22 +1,94 @@
 from uuid import UUID
-from typing import Annotated, Optional, TYPE_CHECKING
+from typing import Annotated, Any, Optional, TYPE_CHECKING
 
 from fastapi import Depends
-from fastapi_users import BaseUserManager, UUIDIDMixin
+from fastapi_users import BaseUserManager, UUIDIDMixin, exceptions
 
 from core import settings
+from users.cache import invalidate_user
 from users.models import User
+from users.password import PooledPasswordHelper, password_helper
 from .users import get_users_db
 
 if TYPE_CHECKING:
     from fastapi import Request
+    from fastapi.security import OAuth2PasswordRequestForm
     from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 
+    from users.schemas import UserCreate
+
 
 class UserManager(UUIDIDMixin, BaseUserManager[User, UUID]):
     reset_password_token_secret = settings.jwt.reset_password_token_secret
     verification_token_secret = settings.jwt.verification_token_secret
 
+    password_helper: PooledPasswordHelper
+
+    def __init__(
+        self,
+        user_db: "SQLAlchemyUserDatabase",
+        password_helper: PooledPasswordHelper = password_helper,
+    ):
+        super().__init__(user_db, password_helper)
+
+    async def create(
+        self,
+        user_create: "UserCreate",
+        safe: bool = False,
+        request: Optional["Request"] = None,
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+
+        existing_user = await self.user_db.get_by_email(user_create.email)
+        if existing_user is not None:
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        password = user_dict.pop("password")
+        user_dict["hashed_password"] = await self.password_helper.async_hash(password)
+
+        created_user = await self.user_db.create(user_dict)
+
+        await self.on_after_register(created_user, request)
+
+        return created_user
+
+    async def authenticate(
+        self, credentials: "OAuth2PasswordRequestForm"
+    ) -> User | None:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Run the hasher anyway so unknown emails take as long as wrong passwords
+            await self.password_helper.async_hash(credentials.password)
+            return None
+
+        verified, updated_password_hash = (
+            await self.password_helper.async_verify_and_update(
+                credentials.password, user.hashed_password
+            )
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+
+        return user
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict = {
+                **{k: v for k, v in update_dict.items() if k != "password"},
+                "hashed_password": await self.password_helper.async_hash(password),
+            }
+        return await super()._update(user, update_dict)
+
     async def on_after_register(self, user: User, request: Optional["Request"] = None):
         print(f"User {user.id} has registered.")
 
@@ -30,6 +102,22 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, UUID]):
     ):
         print(f"Verification requested for user {user.id}. Verification token: {token}")
 
+    async def on_after_update(
+        self, user: User, update_dict: dict, request: Optional["Request"] = None
+    ):
+        await invalidate_user(user.id)
+
+    async def on_after_verify(self, user: User, request: Optional["Request"] = None):
+        await invalidate_user(user.id)
+
+    async def on_after_reset_password(
+        self, user: User, request: Optional["Request"] = None
+    ):
+        await invalidate_user(user.id)
+
+    async def on_after_delete(self, user: User, request: Optional["Request"] = None):
+        await invalidate_user(user.id)
+
 
 async def get_user_manager(
     users_db: Annotated[
@@ -0,0 +1,51 @@
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from core import settings
+from core.config import PasswordSettings
+
+
+class PooledPasswordHelper(PasswordHelper):
+    """Password helper hashing in a bounded thread pool instead of the event loop,
+    argon2 and bcrypt release the GIL while they work"""
+
+    def __init__(self, password_settings: PasswordSettings):
+        super().__init__(
+            PasswordHash(
+                (
+                    Argon2Hasher(
+                        time_cost=password_settings.time_cost,
+                        memory_cost=password_settings.memory_cost,
+                        parallelism=password_settings.parallelism,
+                    ),
+                    BcryptHasher(rounds=password_settings.bcrypt_rounds),
+                )
+            )
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=password_settings.max_concurrency,
+            thread_name_prefix="password",
+        )
+
+    async def async_hash(self, password: str) -> str:
+        return await get_running_loop().run_in_executor(
+            self.executor, self.hash, password
+        )
+
+    async def async_verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Verify the password, and get a new hash when the stored one was made
+        with another hasher or other parameters"""
+
+        return await get_running_loop().run_in_executor(
+            self.executor, self.verify_and_update, plain_password, hashed_password
+        )
+
+
+password_helper = PooledPasswordHelper(settings.password)
@@ -9,7 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import StaticPool
 
 from app.app import app
-from core import Answer, Base, Question
+from core import Answer, Base, Question, cache
+from core.metrics import observe_statements
 from users import User, jwt_strategy
 from .utils import create_answer, create_question, create_user, override_db_session
 
@@ -41,6 +42,8 @@ async def test_engine() -> AsyncGenerator:
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
 
+    observe_statements("test", engine.sync_engine)
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
@@ -69,6 +72,7 @@ async def test_session(test_engine) -> AsyncGenerator:
         for table in reversed(Base.metadata.sorted_tables):
             await session.execute(table.delete())
         await session.commit()
+        await cache.clear()
 
         yield session
         await session.close()
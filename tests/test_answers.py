@@ -1,8 +1,10 @@
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.services import bulk
 from core import Answer, Question
 from users import User
+from .utils import capture_statements, fail_inserts_of
 
 
 class TestGetAnswer:
@@ -49,6 +51,25 @@ class TestDeleteAnswer:
         deleted_answer = await test_session.get(Answer, answer_id)
         assert deleted_answer is None
 
+    async def test_delete_answer_single_statement(
+        self,
+        authenticated_client: AsyncClient,
+        test_answer: Answer,
+        test_engine: AsyncEngine,
+    ):
+        """Test that ownership is checked inside the DELETE statement"""
+
+        with capture_statements(test_engine) as statements:
+            response = await authenticated_client.delete(
+                f"/api/answers/{test_answer.id}"
+            )
+        assert response.status_code == 204
+
+        answer_statements = [s for s, _ in statements if "FROM user " not in s]
+        assert len(answer_statements) == 1
+        assert answer_statements[0].startswith("DELETE FROM answers")
+        assert "user_id" in answer_statements[0]
+
     async def test_delete_answer_requires_authentication(
         self, client: AsyncClient, test_answer: Answer
     ):
@@ -99,6 +120,87 @@ class TestAnswerRelationships:
         assert data["user_id"] == str(test_user.id)
 
 
+class TestListAnswers:
+    """Tests for GET /api/questions/{id}/answers endpoint"""
+
+    async def test_list_answers_paginated(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+    ):
+        ids = []
+        for i in range(3):
+            response = await authenticated_client.post(
+                f"/api/questions/{test_question.id}/answers", json={"text": f"A{i}"}
+            )
+            ids.append(response.json()["id"])
+        await authenticated_client.post(
+            f"/api/questions/{test_question2.id}/answers", json={"text": "Other"}
+        )
+
+        response = await authenticated_client.get(
+            f"/api/questions/{test_question.id}/answers?page=2&size=2"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == ids[2:]
+        assert data["total"] == 3
+        assert data["pages"] == 2
+
+    async def test_list_answers_empty(
+        self, client: AsyncClient, test_question: Question
+    ):
+        response = await client.get(f"/api/questions/{test_question.id}/answers")
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+        assert response.json()["total"] == 0
+
+    async def test_list_answers_nonexistent_question(self, client: AsyncClient):
+        response = await client.get("/api/questions/99999/answers")
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"].lower()
+
+
+class TestListAnswersCursor:
+    """Tests for GET /api/questions/{id}/answers/cursor endpoint"""
+
+    async def test_list_answers_cursor_walks_all_pages(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+    ):
+        """Test that only the question's answers are paged through in order"""
+
+        ids = []
+        for i in range(3):
+            response = await authenticated_client.post(
+                f"/api/questions/{test_question.id}/answers", json={"text": f"A{i}"}
+            )
+            ids.append(response.json()["id"])
+        await authenticated_client.post(
+            f"/api/questions/{test_question2.id}/answers", json={"text": "Other"}
+        )
+
+        url = f"/api/questions/{test_question.id}/answers/cursor"
+        response = await authenticated_client.get(url, params={"size": 2})
+        first = response.json()
+        assert [item["id"] for item in first["items"]] == ids[:2]
+
+        response = await authenticated_client.get(
+            url, params={"size": 2, "cursor": first["next_cursor"]}
+        )
+        second = response.json()
+        assert [item["id"] for item in second["items"]] == ids[2:]
+        assert second["next_cursor"] is None
+
+    async def test_list_answers_cursor_nonexistent_question(self, client: AsyncClient):
+        response = await client.get("/api/questions/99999/answers/cursor")
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"].lower()
+
+
 class TestCreateAnswer:
     """Tests for POST /api/questions/{id}/answers/ endpoint"""
 
@@ -124,6 +226,27 @@ class TestCreateAnswer:
         assert data["question_id"] == test_question.id
         assert data["user_id"] == str(test_user.id)
 
+    async def test_create_answer_single_statement(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_user: User,
+        test_engine: AsyncEngine,
+    ):
+        """Test that creating an answer is one INSERT ... RETURNING"""
+
+        with capture_statements(test_engine) as statements:
+            response = await authenticated_client.post(
+                f"/api/questions/{test_question.id}/answers", json={"text": "Hi"}
+            )
+        assert response.status_code == 201
+
+        answer_statements = [s for s, _ in statements if "answers" in s]
+        assert len(answer_statements) == 1
+        assert answer_statements[0].startswith("INSERT INTO answers")
+        assert "RETURNING" in answer_statements[0]
+        assert not any("FROM questions" in s for s, _ in statements)
+
     async def test_create_answer_requires_authentication(
         self, client: AsyncClient, test_question: Question
     ):
@@ -218,3 +341,67 @@ class TestCreateAnswer:
             f"/api/questions/{test_question.id}/answers", json=answer_data
         )
         assert response.status_code == 422
+
+
+class TestCreateAnswersBulk:
+    """Tests for POST /api/questions/{id}/answers/bulk endpoint"""
+
+    async def test_create_answers_bulk(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_user: User,
+    ):
+        items = [{"text": "A0"}, {"text": ""}, {"text": "A2"}]
+        response = await authenticated_client.post(
+            f"/api/questions/{test_question.id}/answers/bulk", json=items
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["text"] for item in data["items"]] == ["A0", "A2"]
+        assert all(item["user_id"] == str(test_user.id) for item in data["items"])
+        assert [error["index"] for error in data["errors"]] == [1]
+
+        response = await authenticated_client.get(f"/api/questions/{test_question.id}")
+        assert response.json()["answer_count"] == 2
+
+    async def test_create_answers_bulk_failed_chunk(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_engine: AsyncEngine,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 2)
+        items = [{"text": f"A{i}"} for i in range(5)]
+        # The shared session's rollback expires the fixtures
+        url = f"/api/questions/{test_question.id}"
+
+        with fail_inserts_of(test_engine, "A0"):
+            response = await authenticated_client.post(
+                f"{url}/answers/bulk", json=items
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["text"] for item in data["items"]] == ["A2", "A3", "A4"]
+        assert [error["index"] for error in data["errors"]] == [0, 1]
+
+        response = await authenticated_client.get(url)
+        assert response.json()["answer_count"] == 3
+
+    async def test_create_answers_bulk_requires_authentication(
+        self, client: AsyncClient, test_question: Question
+    ):
+        response = await client.post(
+            f"/api/questions/{test_question.id}/answers/bulk", json=[{"text": "A"}]
+        )
+        assert response.status_code == 401
+
+    async def test_create_answers_bulk_nonexistent_question(
+        self, authenticated_client: AsyncClient
+    ):
+        response = await authenticated_client.post(
+            "/api/questions/99999/answers/bulk", json=[{"text": "A"}]
+        )
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"].lower()
@@ -0,0 +1,120 @@
+from io import StringIO
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmark import (
+    Dataset,
+    benchmark_projection,
+    benchmark_serialization,
+    run_benchmark,
+    seed,
+)
+from benchmark.__main__ import compare
+from benchmark.driver import in_process_client
+from core import Answer, Question
+
+DATASET = Dataset("tiny", questions=20, answers=60, users=3, skew=1.2)
+
+
+async def seed_tiny(tmp_path) -> str:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'benchmark.db'}"
+    engine = create_async_engine(url)
+    await seed(engine, DATASET)
+    await engine.dispose()
+    return url
+
+
+class TestSeed:
+    """Tests for the benchmark dataset seeder"""
+
+    async def test_counters_match_answers(self, tmp_path):
+        url = await seed_tiny(tmp_path)
+        engine = create_async_engine(url)
+        async with engine.connect() as conn:
+            counts = dict(
+                (
+                    await conn.execute(
+                        select(Answer.question_id, func.count()).group_by(
+                            Answer.question_id
+                        )
+                    )
+                ).all()
+            )
+            questions = (
+                await conn.execute(select(Question.id, Question.answer_count))
+            ).all()
+        await engine.dispose()
+
+        assert len(questions) == 20
+        assert sum(counts.values()) == 60
+        assert all(count == counts.get(id, 0) for id, count in questions)
+        # Skewed, the first question is the hottest
+        assert counts[1] == max(counts.values())
+
+    async def test_same_seed_same_rows(self, tmp_path):
+        texts = []
+        for name in ("first", "second"):
+            (tmp_path / name).mkdir()
+            engine = create_async_engine(await seed_tiny(tmp_path / name))
+            async with engine.connect() as conn:
+                texts.append((await conn.scalars(select(Answer.text))).all())
+            await engine.dispose()
+        assert texts[0] == texts[1]
+
+
+class TestRunBenchmark:
+    """Tests for driving the app in-process"""
+
+    async def test_reports_every_endpoint(self, tmp_path):
+        url = await seed_tiny(tmp_path)
+        async with in_process_client(url) as client:
+            results = await run_benchmark(client, DATASET, requests=5, concurrency=2)
+
+        assert len(results) == 8
+        for result in results.values():
+            assert result["requests"] == 5
+            assert result["errors"] == 0
+            assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+        assert results["list_answers"]["queries_per_request"] > 0
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            "endpoints": {
+                "get_question": {
+                    "p95_ms": 10,
+                    "requests_per_second": 100,
+                    "queries_per_request": 2,
+                }
+            }
+        }
+        slower = {"get_question": {**baseline["endpoints"]["get_question"]}}
+        slower["get_question"]["p95_ms"] = 12
+
+        assert compare(baseline, baseline, 0.1, StringIO())
+        output = StringIO()
+        assert not compare(baseline, {"endpoints": slower}, 0.1, output)
+        assert "REGRESSED: p95" in output.getvalue()
+
+
+class TestProjectionBenchmark:
+    """Tests for comparing entity hydration with column projection"""
+
+    async def test_reports_both_ways(self, tmp_path):
+        url = await seed_tiny(tmp_path)
+        results = await benchmark_projection(url, rows=10, repeat=2)
+
+        assert set(results) == {"questions", "answers"}
+        for result in results.values():
+            assert result["entities"]["us_per_row"] > 0
+            assert 0 < result["columns"]["kib_per_row"]
+
+
+class TestSerializationBenchmark:
+    """Tests for timing the fast JSON path"""
+
+    def test_same_payload_both_ways(self):
+        result = benchmark_serialization(answers=20, repeat=2)
+
+        assert result["identical"]
+        assert result["validated_ms"] > 0 and result["fast_ms"] > 0
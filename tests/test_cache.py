@@ -0,0 +1,187 @@
+from time import time
+from unittest.mock import patch
+
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.services import QuestionService
+from core import Answer, Question, db_helper
+from core.cache import MemoryCache, RedisCache
+from core.db_helper import PRIMARY_READS_COOKIE
+from .utils import FakeRedis, capture_statements, create_question
+
+
+def cache_sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMemoryCache:
+    """Tests for the in-process cache backend"""
+
+    async def test_get_set_delete(self):
+        cache = MemoryCache()
+        await cache.set("question:1", "50", b"payload")
+        await cache.set("question:1", "10", b"short")
+
+        assert await cache.get("question:1", "50") == b"payload"
+        assert await cache.get("question:1", "10") == b"short"
+        assert await cache.get("question:1", "20") is None
+
+        await cache.delete("question:1")
+        assert await cache.get("question:1", "50") is None
+
+    async def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_entries=2)
+        evictions = cache_sample("cache_evictions_total", backend="memory")
+
+        await cache.set("a", "f", b"a")
+        await cache.set("b", "f", b"b")
+        await cache.get("a", "f")
+        await cache.set("c", "f", b"c")
+
+        assert await cache.get("b", "f") is None
+        assert await cache.get("a", "f") == b"a"
+        assert cache_sample("cache_evictions_total", backend="memory") == (
+            evictions + 1
+        )
+
+    async def test_expires_after_ttl(self):
+        cache = MemoryCache(ttl=30)
+        with patch("core.cache.monotonic", return_value=100):
+            await cache.set("a", "f", b"a")
+        with patch("core.cache.monotonic", return_value=129):
+            assert await cache.get("a", "f") == b"a"
+        with patch("core.cache.monotonic", return_value=131):
+            assert await cache.get("a", "f") is None
+
+    async def test_fields_expire_separately(self):
+        cache = MemoryCache(ttl=30)
+        with patch("core.cache.monotonic", return_value=100):
+            await cache.set("questions", "1", b"old")
+        with patch("core.cache.monotonic", return_value=120):
+            await cache.set("questions", "2", b"new")
+        with patch("core.cache.monotonic", return_value=131):
+            assert await cache.get("questions", "1") is None
+            assert await cache.get("questions", "2") == b"new"
+
+    async def test_fields_count_towards_max_entries(self):
+        cache = MemoryCache(max_entries=2)
+        for page in range(100):
+            await cache.set("questions", str(page), b"page")
+
+        assert len(cache._entries) == 2
+        assert await cache.get("questions", "0") is None
+        assert await cache.get("questions", "99") == b"page"
+
+        await cache.delete("questions")
+        assert await cache.get("questions", "99") is None
+        assert cache._fields == {}
+
+
+class TestRedisCache:
+    """Tests for the Redis cache backend against a fake client"""
+
+    async def test_get_set_delete_clear(self):
+        client = FakeRedis()
+        cache = RedisCache(client, ttl=15)
+
+        await cache.set("question:1", "50", b"payload")
+        await cache.set("questions", "1:50", b"page")
+        assert client.ttls == {
+            ("qa:question:1", "50"): 15,
+            ("qa:questions", "1:50"): 15,
+        }
+        assert await cache.get("question:1", "50") == b"payload"
+
+        await cache.delete("question:1")
+        assert await cache.get("question:1", "50") is None
+        assert await cache.get("questions", "1:50") == b"page"
+
+        await cache.clear()
+        assert client.data == {}
+
+
+class TestResponseCache:
+    """Tests for caching and invalidating question responses"""
+
+    async def test_question_detail_cached_until_answer_changes(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_answer: Answer,
+        test_engine: AsyncEngine,
+    ):
+        url = f"/api/questions/{test_question.id}"
+        hits = cache_sample("cache_requests_total", backend="memory", result="hit")
+
+        first = await authenticated_client.get(url)
+        with capture_statements(test_engine) as statements:
+            second = await authenticated_client.get(url)
+        assert statements == []
+        assert second.json() == first.json()
+        assert cache_sample("cache_requests_total", backend="memory", result="hit") == (
+            hits + 1
+        )
+
+        await authenticated_client.post(f"{url}/answers", json={"text": "New"})
+        assert (await authenticated_client.get(url)).json()["answer_count"] == 2
+
+        await authenticated_client.delete(f"/api/answers/{test_answer.id}")
+        assert (await authenticated_client.get(url)).json()["answer_count"] == 1
+
+    async def test_questions_listing_invalidated_by_writes(self, client: AsyncClient):
+        assert (await client.get("/api/questions/")).json()["total"] == 0
+
+        response = await client.post("/api/questions/", json={"text": "Cached?"})
+        question_id = response.json()["id"]
+        assert (await client.get("/api/questions/")).json()["total"] == 1
+        assert (await client.get(f"/api/questions/{question_id}")).status_code == 200
+
+        await client.delete(f"/api/questions/{question_id}")
+        assert (await client.get("/api/questions/")).json()["total"] == 0
+        assert (await client.get(f"/api/questions/{question_id}")).status_code == 404
+
+    async def test_listing_pages_cached_separately(self, client: AsyncClient):
+        for i in range(3):
+            await client.post("/api/questions/", json={"text": f"Q{i}"})
+
+        first = await client.get("/api/questions/?page=1&size=2")
+        second = await client.get("/api/questions/?page=2&size=2")
+        assert len(first.json()["items"]) == 2
+        assert len(second.json()["items"]) == 1
+
+    async def test_sticky_reads_skip_cache(
+        self, client: AsyncClient, test_session: AsyncSession, monkeypatch
+    ):
+        monkeypatch.setattr(db_helper, "replica_session_factories", [object()])
+        assert (await client.get("/api/questions/")).json()["total"] == 0
+        # A write the cache missed, as if a lagging replica refilled it
+        await create_question("Written?", test_session)
+        assert (await client.get("/api/questions/")).json()["total"] == 0
+
+        client.cookies.set(PRIMARY_READS_COOKIE, str(time() + 5))
+        assert (await client.get("/api/questions/")).json()["total"] == 1
+        client.cookies.clear()
+        assert (await client.get("/api/questions/")).json()["total"] == 1
+
+    async def test_not_cached_when_version_changes_while_loading(
+        self, client: AsyncClient, test_session: AsyncSession, monkeypatch
+    ):
+        list_questions = QuestionService.list_questions
+
+        async def write_while_loading(*args, **kwargs):
+            page = await list_questions(*args, **kwargs)
+            await create_question("Concurrent", test_session)
+            return page
+
+        monkeypatch.setattr(QuestionService, "list_questions", write_while_loading)
+        first = await client.get("/api/questions/")
+        assert first.json()["total"] == 0
+
+        monkeypatch.setattr(QuestionService, "list_questions", list_questions)
+        response = await client.get(
+            "/api/questions/", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
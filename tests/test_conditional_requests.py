@@ -0,0 +1,193 @@
+from email.utils import format_datetime
+from datetime import UTC, datetime, timedelta
+
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.services import QuestionService
+from core import Answer, Deletion, Question, cache
+from users import User
+from .utils import capture_statements, create_answer, explain_query_plan
+
+
+class TestQuestionDetailETag:
+    """Tests for conditional GET /api/questions/{id}"""
+
+    async def test_not_modified(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_answer: Answer,
+        test_engine: AsyncEngine,
+    ):
+        url = f"/api/questions/{test_question.id}"
+        response = await client.get(url)
+        etag = response.headers["etag"]
+        assert response.status_code == 200
+        assert "last-modified" in response.headers
+
+        with capture_statements(test_engine) as statements:
+            response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert statements == []
+
+    async def test_not_modified_without_cache_loads_no_answers(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_answer: Answer,
+        test_engine: AsyncEngine,
+    ):
+        url = f"/api/questions/{test_question.id}"
+        etag = (await client.get(url)).headers["etag"]
+        await cache.clear()
+
+        with capture_statements(test_engine) as statements:
+            response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert len(statements) == 1
+        assert "count" in statements[0][0]
+
+    async def test_etag_changes_with_answers_and_limit(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_answer: Answer,
+    ):
+        url = f"/api/questions/{test_question.id}"
+        etag = (await authenticated_client.get(url)).headers["etag"]
+        limited = await authenticated_client.get(f"{url}?answers_limit=1")
+        assert limited.headers["etag"] != etag
+
+        await authenticated_client.post(f"{url}/answers", json={"text": "New"})
+        response = await authenticated_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+        await authenticated_client.delete(f"/api/answers/{test_answer.id}")
+        await cache.clear()
+        response = await authenticated_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    async def test_not_found(self, client: AsyncClient):
+        response = await client.get(
+            "/api/questions/99999", headers={"If-None-Match": "*"}
+        )
+        assert response.status_code == 404
+
+
+class TestQuestionsListingETag:
+    """Tests for conditional GET /api/questions/"""
+
+    async def test_etag_changes_on_create_and_delete(
+        self, client: AsyncClient, test_question: Question
+    ):
+        etag = (await client.get("/api/questions/")).headers["etag"]
+        response = await client.get("/api/questions/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        response = await client.post("/api/questions/", json={"text": "New"})
+        new_id = response.json()["id"]
+        response = await client.get("/api/questions/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        created_etag = response.headers["etag"]
+
+        await client.delete(f"/api/questions/{new_id}")
+        response = await client.get(
+            "/api/questions/", headers={"If-None-Match": created_etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] not in (etag, created_etag)
+
+    async def test_etag_changes_when_older_rows_change(
+        self,
+        authenticated_client: AsyncClient,
+        test_session: AsyncSession,
+        test_question: Question,
+        test_question2: Question,
+        test_answer: Answer,
+        test_user: User,
+    ):
+        # Neither delete moves a maximum the version is read from
+        await create_answer("Later", test_question.id, test_user.id, test_session)
+        etag = (await authenticated_client.get("/api/questions/")).headers["etag"]
+        await authenticated_client.delete(f"/api/answers/{test_answer.id}")
+        await cache.clear()
+        response = await authenticated_client.get(
+            "/api/questions/", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+        await create_answer("Latest", test_question2.id, test_user.id, test_session)
+        etag = (await authenticated_client.get("/api/questions/")).headers["etag"]
+        await authenticated_client.delete(f"/api/questions/{test_question.id}")
+        await cache.clear()
+        response = await authenticated_client.get(
+            "/api/questions/", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+    async def test_etag_changes_on_cascaded_delete(
+        self,
+        client: AsyncClient,
+        test_session: AsyncSession,
+        test_answer: Answer,
+        test_user: User,
+    ):
+        await create_answer("More", test_answer.question_id, test_user.id, test_session)
+        etag = (await client.get("/api/questions/")).headers["etag"]
+        # Outside the services, as deleting the user would
+        await test_session.execute(delete(Answer).where(Answer.user_id == test_user.id))
+        await test_session.commit()
+        await cache.clear()
+
+        response = await client.get("/api/questions/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        # Only the newest deletion is kept
+        assert (
+            await test_session.scalar(select(func.count()).select_from(Deletion)) == 1
+        )
+
+    async def test_version_reads_index_ends(
+        self, test_session: AsyncSession, test_engine: AsyncEngine
+    ):
+        with capture_statements(test_engine) as statements:
+            await QuestionService.get_questions_version(test_session)
+
+        plan = await explain_query_plan(test_session, *statements[0])
+        for table in ("questions", "answers", "deletions"):
+            assert f"SCAN {table}" not in plan
+
+    async def test_pages_have_different_etags(self, client: AsyncClient):
+        first = await client.get("/api/questions/?page=1")
+        second = await client.get("/api/questions/?page=2")
+        assert first.headers["etag"] != second.headers["etag"]
+
+
+class TestAnswerETag:
+    """Tests for conditional GET /api/answers/{id}"""
+
+    async def test_if_none_match(self, client: AsyncClient, test_answer: Answer):
+        url = f"/api/answers/{test_answer.id}"
+        etag = (await client.get(url)).headers["etag"]
+
+        response = await client.get(url, headers={"If-None-Match": f'"x", {etag}'})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        response = await client.get(url, headers={"If-None-Match": '"other"'})
+        assert response.status_code == 200
+
+    async def test_if_modified_since(self, client: AsyncClient, test_answer: Answer):
+        url = f"/api/answers/{test_answer.id}"
+        last_modified = (await client.get(url)).headers["last-modified"]
+
+        response = await client.get(url, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+        earlier = format_datetime(datetime.now(UTC) - timedelta(days=1), usegmt=True)
+        response = await client.get(url, headers={"If-Modified-Since": earlier})
+        assert response.status_code == 200
@@ -0,0 +1,146 @@
+from time import time
+
+import pytest
+from fastapi import Request, Response
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from core import DBHelper, db_helper
+from core.config import DBSettings
+from core.db_helper import PRIMARY_READS_COOKIE
+
+
+class TestPoolSettings:
+    """Tests for connection pool sizing"""
+
+    def test_pool_kwargs_defaults(self):
+        kwargs = DBSettings().pool_kwargs
+        assert kwargs["pool_size"] == 5
+        assert kwargs["max_overflow"] == 10
+        assert kwargs["pool_pre_ping"] is True
+
+    def test_pool_kwargs_capped_per_worker(self):
+        """Test that all workers together stay within max_connections"""
+
+        db = DBSettings(
+            pool_size=10, max_overflow=10, max_connections=48, web_concurrency=8
+        )
+        kwargs = db.pool_kwargs
+        assert kwargs["pool_size"] == 6
+        assert kwargs["max_overflow"] == 0
+
+    def test_connect_args(self):
+        db = DBSettings(statement_timeout=5000, statement_cache_size=0)
+        assert db.connect_args == {
+            "statement_cache_size": 0,
+            "server_settings": {"statement_timeout": "5000"},
+        }
+
+    def test_url_override(self):
+        db = DBSettings(DB_URL="sqlite+aiosqlite:///qa.db")
+        assert db.url == "sqlite+aiosqlite:///qa.db"
+        assert db.connect_args == {}
+
+
+class TestPoolMetrics:
+    """Tests for connection pool metrics"""
+
+    async def test_checkout_wait_and_saturation(self, tmp_path):
+        helper = DBHelper(
+            url=f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            name="test_pool",
+            pool_size=2,
+            max_overflow=0,
+        )
+        labels = {"pool": "test_pool"}
+
+        async with helper.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert REGISTRY.get_sample_value("db_pool_saturation", labels) == 0.5
+            assert REGISTRY.get_sample_value("db_pool_checked_out", labels) == 1
+
+        assert REGISTRY.get_sample_value("db_pool_saturation", labels) == 0
+        assert REGISTRY.get_sample_value("db_pool_checkout_seconds_count", labels) == 1
+
+        await helper.engine.dispose()
+
+    @pytest.mark.parametrize(
+        "pool_kwargs", [{"pool_size": 0}, {"pool_size": 2, "max_overflow": -1}]
+    )
+    async def test_unbounded_pool_has_no_saturation(self, tmp_path, pool_kwargs):
+        helper = DBHelper(
+            url=f"sqlite+aiosqlite:///{tmp_path / 'unbounded.db'}",
+            name="unbounded_pool",
+            **pool_kwargs,
+        )
+        labels = {"pool": "unbounded_pool"}
+
+        async with helper.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert REGISTRY.get_sample_value("db_pool_checked_out", labels) == 1
+            assert REGISTRY.get_sample_value("db_pool_saturation", labels) is None
+
+        await helper.engine.dispose()
+
+    async def test_metrics_endpoint(self, client: AsyncClient):
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert 'db_pool_size{pool="primary"} 5.0' in response.text
+
+
+def make_request(cookies: dict[str, str] | None = None) -> Request:
+    cookie = "; ".join(f"{key}={value}" for key, value in (cookies or {}).items())
+    return Request({"type": "http", "headers": [(b"cookie", cookie.encode())]})
+
+
+async def read_db_name(helper: DBHelper, request: Request) -> str:
+    async for session in helper.read_session_dependency(request):
+        return await session.scalar(text("SELECT name FROM db"))
+
+
+class TestReadReplicas:
+    """Tests for routing reads to replicas"""
+
+    async def test_replicas_round_robin_and_sticky_primary(self, tmp_path):
+        names = ["primary", "replica_0", "replica_1"]
+        urls = [f"sqlite+aiosqlite:///{tmp_path / name}.db" for name in names]
+        helper = DBHelper(
+            url=urls[0], name="rr_test", replica_urls=urls[1:], pool_size=1
+        )
+
+        for name, engine in zip(names, [helper.engine, *helper.replica_engines]):
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE db (name TEXT)"))
+                await conn.execute(text(f"INSERT INTO db VALUES ('{name}')"))
+
+        reads = [await read_db_name(helper, make_request()) for _ in range(4)]
+        assert reads == ["replica_0", "replica_1", "replica_0", "replica_1"]
+
+        response = Response()
+        helper.stick_to_primary(response)
+        assert PRIMARY_READS_COOKIE in response.headers["set-cookie"]
+
+        sticky = make_request({PRIMARY_READS_COOKIE: str(time() + 5)})
+        assert await read_db_name(helper, sticky) == "primary"
+
+        expired = make_request({PRIMARY_READS_COOKIE: str(time() - 1)})
+        assert await read_db_name(helper, expired) == "replica_0"
+
+        await helper.dispose()
+        assert all(engine.pool.checkedin() == 0 for engine in helper.engines)
+
+    async def test_reads_use_primary_without_replicas(self):
+        assert db_helper.get_read_session_factory(make_request()) is (
+            db_helper.session_factory
+        )
+
+    async def test_write_sets_sticky_cookie(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(db_helper, "replica_session_factories", [object()])
+
+        response = await client.post("/api/questions/", json={"text": "Sticky?"})
+        assert response.status_code == 201
+        assert PRIMARY_READS_COOKIE in response.cookies
+
+        response = await client.get("/api/questions/")
+        assert PRIMARY_READS_COOKIE not in response.headers.get("set-cookie", "")
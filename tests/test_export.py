@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+import export
+from app.services import ExportService, export_service
+from core import Answer, Question, db_helper
+from users import User
+from .utils import capture_statements, create_answer
+
+
+class TestExportQuestions:
+    """Tests for GET /api/questions/export endpoint"""
+
+    async def test_export_ndjson(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+        test_answer: Answer,
+        test_user: User,
+        test_session: AsyncSession,
+    ):
+        second = await create_answer(
+            "Second", test_question.id, test_user.id, test_session
+        )
+
+        response = await client.get("/api/questions/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == [test_question.id, test_question2.id]
+        assert [answer["id"] for answer in lines[0]["answers"]] == [
+            test_answer.id,
+            second.id,
+        ]
+        assert lines[0]["answer_count"] == 2
+        assert lines[1]["answers"] == []
+
+        detail = await client.get(f"/api/questions/{test_question.id}")
+        assert lines[0] == detail.json()
+
+    async def test_export_csv(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+        test_answer: Answer,
+    ):
+        response = await client.get("/api/questions/export?format=csv")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 2
+        assert rows[0]["question_id"] == str(test_question.id)
+        assert rows[0]["answer_text"] == test_answer.text
+        assert rows[1]["question_id"] == str(test_question2.id)
+        assert rows[1]["answer_id"] == ""
+
+    async def test_export_created_range(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+    ):
+        response = await client.get(
+            "/api/questions/export",
+            params={
+                "created_after": test_question2.created_at.isoformat(),
+                "created_before": (
+                    test_question2.created_at + timedelta(seconds=1)
+                ).isoformat(),
+            },
+        )
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == [test_question2.id]
+
+    async def test_export_single_query_in_chunks(
+        self,
+        client: AsyncClient,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        monkeypatch,
+    ):
+        """Test that the export is one query written out in several chunks"""
+
+        monkeypatch.setattr(export_service, "EXPORT_BUFFER_SIZE", 64)
+        for i in range(5):
+            await client.post("/api/questions/", json={"text": f"Q{i}" * 20})
+
+        with capture_statements(test_engine) as statements:
+            chunks = [
+                chunk
+                async for chunk in ExportService.to_ndjson(
+                    ExportService.stream_questions(test_session)
+                )
+            ]
+        assert len(statements) == 1
+        assert len(chunks) > 1
+        assert len("".join(chunks).splitlines()) == 5
+
+    async def test_export_cli(
+        self, test_engine: AsyncEngine, test_question: Question, monkeypatch
+    ):
+        monkeypatch.setattr(
+            db_helper, "session_factory", async_sessionmaker(test_engine)
+        )
+        output = io.StringIO()
+
+        await export.export(export.parse_args(["--format", "csv"]), output)
+
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        assert [row["question_text"] for row in rows] == [test_question.text]
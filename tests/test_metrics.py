@@ -0,0 +1,76 @@
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+
+from core import Question, settings
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestRequestMetrics:
+    """Tests for the per-route request metrics"""
+
+    async def test_request_counted_per_route_template(
+        self, client: AsyncClient, test_question: Question
+    ):
+        route = {"method": "GET", "route": "/api/questions/{question_id}"}
+        count = sample("http_requests_total", status="200", **route)
+        durations = sample("http_request_duration_seconds_count", **route)
+
+        response = await client.get(f"/api/questions/{test_question.id}")
+        assert response.status_code == 200
+
+        assert sample("http_requests_total", status="200", **route) == count + 1
+        assert sample("http_request_duration_seconds_count", **route) == durations + 1
+        assert sample("http_requests_in_progress", **route) == 0
+
+    async def test_request_db_time(
+        self, client: AsyncClient, test_question: Question, monkeypatch
+    ):
+        monkeypatch.setattr(settings.api, "server_timing", True)
+        route = {"method": "GET", "route": "/api/questions/{question_id}"}
+        statements = sample("http_request_db_statements_sum", **route)
+
+        response = await client.get(f"/api/questions/{test_question.id}")
+
+        assert sample("http_request_db_statements_sum", **route) > statements
+        assert sample("http_request_db_seconds_sum", **route) > 0
+        db, pool, total = response.headers["Server-Timing"].split(", ")
+        db_dur, statements = db.removeprefix("db;dur=").split(";desc=")
+        assert 0 < float(db_dur) <= float(total.removeprefix("total;dur="))
+        assert pool.startswith("pool;dur=")
+        assert statements == '"3 statements"'
+
+    async def test_no_server_timing_by_default(
+        self, client: AsyncClient, test_question: Question
+    ):
+        response = await client.get(f"/api/questions/{test_question.id}")
+        assert "Server-Timing" not in response.headers
+
+    async def test_unmatched_route(self, client: AsyncClient):
+        route = {"method": "GET", "route": "unmatched"}
+        count = sample("http_requests_total", status="404", **route)
+
+        response = await client.get("/not/a/route")
+        assert response.status_code == 404
+
+        assert sample("http_requests_total", status="404", **route) == count + 1
+
+    async def test_statement_durations(self, client: AsyncClient):
+        labels = {"pool": "test", "operation": "INSERT"}
+        count = sample("db_statement_duration_seconds_count", **labels)
+
+        response = await client.post("/api/questions/", json={"text": "Timed?"})
+        assert response.status_code == 201
+
+        assert sample("db_statement_duration_seconds_count", **labels) == count + 1
+
+    async def test_exposed_on_metrics_endpoint(self, client: AsyncClient):
+        await client.get("/api/questions/")
+
+        response = await client.get("/metrics")
+        assert (
+            'http_request_duration_seconds_bucket{le="0.001",method="GET",'
+            'route="/api/questions/"}' in response.text
+        )
@@ -0,0 +1,248 @@
+import inspect
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi_pagination import add_pagination
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.app import app
+from app.budget import get_query_budget, query_budget
+from app.services import AnswerService, ExportService, QuestionService
+from app.services.bulk import BULK_CHUNK_SIZE
+from core import Answer, Question, db_helper
+from users import User, jwt_strategy
+from .utils import record_queries, within_budget
+
+SERVICES = (AnswerService, ExportService, QuestionService)
+# Above every page size and limit, so fetching more than asked for shows
+ROWS = 120
+BULK_ITEMS = [{"text": f"Bulk {i}"} for i in range(BULK_CHUNK_SIZE + 1)]
+
+
+@dataclass(frozen=True)
+class Call:
+    """A successful request to a route, ids are filled in from the data"""
+
+    method: str
+    route: str
+    url: str
+    json: Any = None
+
+
+CALLS = (
+    Call("GET", "/api/questions/", "/api/questions/?size=100"),
+    Call(
+        "GET",
+        "/api/questions/search",
+        "/api/questions/search?q=question&include_answers=true&size=100",
+    ),
+    Call("GET", "/api/questions/cursor", "/api/questions/cursor?size=100"),
+    Call("GET", "/api/questions/export", "/api/questions/export"),
+    Call(
+        "GET",
+        "/api/questions/{question_id}",
+        "/api/questions/{question_id}?answers_limit=100",
+    ),
+    Call("POST", "/api/questions/", "/api/questions/", {"text": "New?"}),
+    Call("POST", "/api/questions/bulk", "/api/questions/bulk", BULK_ITEMS),
+    Call("DELETE", "/api/questions/{question_id}", "/api/questions/{question_id}"),
+    Call(
+        "GET",
+        "/api/questions/{question_id}/answers",
+        "/api/questions/{question_id}/answers?size=100",
+    ),
+    Call(
+        "GET",
+        "/api/questions/{question_id}/answers/cursor",
+        "/api/questions/{question_id}/answers/cursor?size=100",
+    ),
+    Call(
+        "POST",
+        "/api/questions/{question_id}/answers",
+        "/api/questions/{question_id}/answers",
+        {"text": "New answer"},
+    ),
+    Call(
+        "POST",
+        "/api/questions/{question_id}/answers/bulk",
+        "/api/questions/{question_id}/answers/bulk",
+        BULK_ITEMS,
+    ),
+    Call("GET", "/api/answers/{answer_id}", "/api/answers/{answer_id}"),
+    Call("DELETE", "/api/answers/{answer_id}", "/api/answers/{answer_id}"),
+)
+
+
+def api_routes() -> list[APIRoute]:
+    return [
+        route
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path.startswith("/api/")
+    ]
+
+
+def service_methods():
+    for service in SERVICES:
+        for name, method in vars(service).items():
+            if isinstance(method, staticmethod) and (
+                "session" in inspect.signature(method.__func__).parameters
+            ):
+                yield service, name, method.__func__
+
+
+@pytest.fixture(autouse=True)
+def enforce_service_budgets(monkeypatch, test_engine: AsyncEngine) -> None:
+    """Check every service method call of the test against its budget"""
+
+    for service, name, func in service_methods():
+        budget = get_query_budget(func)
+        checked = within_budget(func, budget, test_engine, f"{service.__name__}.{name}")
+        monkeypatch.setattr(service, name, staticmethod(checked))
+
+
+@pytest.fixture
+async def budget_data(test_session: AsyncSession, test_user: User) -> dict[str, int]:
+    """ROWS questions, the first with ROWS answers of test_user"""
+
+    question_ids = (
+        await test_session.scalars(
+            insert(Question).returning(Question.id),
+            [{"text": f"Budget question {i}"} for i in range(ROWS)],
+        )
+    ).all()
+    question_id = min(question_ids)
+    answer_ids = (
+        await test_session.scalars(
+            insert(Answer).returning(Answer.id),
+            [
+                {
+                    "text": f"Budget answer {i}",
+                    "question_id": question_id,
+                    "user_id": test_user.id,
+                }
+                for i in range(ROWS)
+            ],
+        )
+    ).all()
+    await test_session.commit()
+    return {"question_id": question_id, "answer_id": max(answer_ids)}
+
+
+@pytest.fixture
+async def budget_client(
+    test_engine: AsyncEngine, test_user: User
+) -> AsyncGenerator[AsyncClient]:
+    """Authenticated client with a session per request, as in production"""
+
+    session_factory = async_sessionmaker(
+        bind=test_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def session_per_request():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[db_helper.session_dependency] = session_per_request
+    app.dependency_overrides[db_helper.read_session_dependency] = session_per_request
+    add_pagination(app)
+    token = await jwt_strategy.write_token(test_user)
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+class TestQueryBudgets:
+    """Tests that routes and service methods stay within their query budgets"""
+
+    def test_every_route_declares_budget(self):
+        missing = [
+            route.path for route in api_routes() if not get_query_budget(route.endpoint)
+        ]
+        assert missing == []
+
+    def test_every_service_method_declares_budget(self):
+        missing = [
+            f"{service.__name__}.{name}"
+            for service, name, func in service_methods()
+            if not get_query_budget(func)
+        ]
+        assert missing == []
+
+    def test_every_route_is_called(self):
+        routes = {
+            (method, route.path) for route in api_routes() for method in route.methods
+        }
+        assert routes == {(call.method, call.route) for call in CALLS}
+
+    @pytest.mark.parametrize(
+        "call", CALLS, ids=[f"{call.method} {call.route}" for call in CALLS]
+    )
+    async def test_route_within_budget(
+        self,
+        call: Call,
+        budget_client: AsyncClient,
+        budget_data: dict[str, int],
+        test_engine: AsyncEngine,
+    ):
+        (route,) = [
+            route
+            for route in api_routes()
+            if route.path == call.route and call.method in route.methods
+        ]
+
+        with record_queries(test_engine) as log:
+            response = await budget_client.request(
+                call.method, call.url.format(**budget_data), json=call.json
+            )
+        assert response.is_success, response.text
+
+        log.assert_within(
+            get_query_budget(route.endpoint), f"{call.method} {call.route}"
+        )
+
+    async def test_n_plus_one_exceeds_budget(
+        self,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        budget_data: dict[str, int],
+    ):
+        @query_budget(statements=1)
+        async def refresh_answers(session: AsyncSession) -> None:
+            answers = (await session.scalars(select(Answer).limit(3))).all()
+            for answer in answers:
+                await session.refresh(answer)
+
+        checked = within_budget(
+            refresh_answers,
+            get_query_budget(refresh_answers),
+            test_engine,
+            "refresh_answers",
+        )
+        with pytest.raises(AssertionError, match="executed 4 statements"):
+            await checked(test_session)
+
+    async def test_over_fetching_exceeds_budget(
+        self,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        budget_data: dict[str, int],
+    ):
+        @query_budget(statements=1, rows=10)
+        async def load_answers(session: AsyncSession) -> None:
+            (await session.scalars(select(Answer))).all()
+
+        checked = within_budget(
+            load_answers, get_query_budget(load_answers), test_engine, "load_answers"
+        )
+        with pytest.raises(AssertionError, match=f"fetched {ROWS} rows"):
+            await checked(test_session)
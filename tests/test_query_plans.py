@@ -0,0 +1,196 @@
+from itertools import product
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from core import Answer, Question
+from users import User
+from .utils import capture_statements, explain_query_plan
+
+
+async def plans_for(
+    client: AsyncClient, url: str, engine: AsyncEngine, session: AsyncSession
+) -> list[str]:
+    """Query plans of every SELECT the endpoint runs"""
+
+    with capture_statements(engine) as statements:
+        response = await client.get(url)
+    assert response.status_code == 200
+
+    plans = [
+        await explain_query_plan(session, statement, parameters)
+        for statement, parameters in statements
+        if statement.lstrip().upper().startswith("SELECT")
+    ]
+    return plans
+
+
+class TestIndexUsage:
+    """Tests that listings and lookups are served by indexes"""
+
+    async def test_answers_listing_uses_question_index(
+        self,
+        client: AsyncClient,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        test_answer: Answer,
+    ):
+        plans = await plans_for(
+            client,
+            f"/api/questions/{test_answer.question_id}/answers",
+            test_engine,
+            test_session,
+        )
+        assert plans
+        assert all("ix_answers_question_id_created_at_id" in plan for plan in plans)
+        assert not any("TEMP B-TREE" in plan for plan in plans)
+
+    async def test_questions_cursor_uses_created_at_index(
+        self,
+        client: AsyncClient,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        test_question: Question,
+        test_question2: Question,
+    ):
+        response = await client.get("/api/questions/cursor?size=1")
+        cursor = response.json()["next_cursor"]
+
+        plans = await plans_for(
+            client, f"/api/questions/cursor?cursor={cursor}", test_engine, test_session
+        )
+        assert len(plans) == 1
+        assert "ix_questions_created_at_id" in plans[0]
+        assert "TEMP B-TREE" not in plans[0]
+
+    async def test_answers_cursor_uses_question_index(
+        self,
+        client: AsyncClient,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        test_answer: Answer,
+    ):
+        plans = await plans_for(
+            client,
+            f"/api/questions/{test_answer.question_id}/answers/cursor",
+            test_engine,
+            test_session,
+        )
+        assert "ix_answers_question_id_created_at_id" in plans[0]
+        assert "TEMP B-TREE" not in plans[0]
+
+    async def test_answers_by_user_uses_user_index(
+        self, test_session: AsyncSession, test_user: User
+    ):
+        plan = await explain_query_plan(
+            test_session,
+            "SELECT id FROM answers WHERE user_id = ?",
+            (test_user.id.hex,),
+        )
+        assert "ix_answers_user_id" in plan
+
+    async def test_questions_sorted_by_answer_counters_use_indexes(
+        self,
+        client: AsyncClient,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        test_question: Question,
+    ):
+        for sort, index in (
+            ("answer_count", "ix_questions_answer_count_id"),
+            ("last_answer_at", "ix_questions_last_answer_at_id"),
+        ):
+            for direction in ("asc", "desc"):
+                plan = await listing_plan(
+                    client,
+                    f"/api/questions/?sort={sort}&direction={direction}",
+                    test_engine,
+                    test_session,
+                )
+                assert index in plan
+                assert "TEMP B-TREE" not in plan
+
+
+def listing_urls() -> list[str]:
+    """Every supported combination of the listing's order and filters"""
+
+    urls = []
+    for sort, direction, has_answers, created_range in product(
+        ("id", "created_at", "answer_count", "last_answer_at"),
+        ("asc", "desc"),
+        (None, "true", "false"),
+        (False, True),
+    ):
+        if created_range and sort != "created_at":
+            continue
+        url = f"/api/questions/?sort={sort}&direction={direction}"
+        if has_answers:
+            url += f"&has_answers={has_answers}"
+        if created_range:
+            url += (
+                "&created_after=2025-01-01T00:00:00&created_before=2030-01-01T00:00:00"
+            )
+        urls.append(url)
+    return urls
+
+
+async def listing_plan(
+    client: AsyncClient, url: str, engine: AsyncEngine, session: AsyncSession
+) -> str:
+    """Query plan of the SELECT of the listing page itself"""
+
+    with capture_statements(engine) as statements:
+        response = await client.get(url)
+    assert response.status_code == 200
+
+    (page_statement,) = [
+        (statement, parameters)
+        for statement, parameters in statements
+        if "ORDER BY" in statement
+    ]
+    return await explain_query_plan(session, *page_statement)
+
+
+class TestListingIndexUsage:
+    """Tests that every order and filter of the questions listing is index-served"""
+
+    async def test_all_combinations_avoid_sorting(
+        self,
+        client: AsyncClient,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        test_question: Question,
+    ):
+        urls = listing_urls()
+        assert len(urls) == 30
+        for url in urls:
+            plan = await listing_plan(client, url, test_engine, test_session)
+            assert "TEMP B-TREE" not in plan, url
+
+    async def test_created_range_uses_created_at_index(
+        self,
+        client: AsyncClient,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+    ):
+        plan = await listing_plan(
+            client,
+            "/api/questions/?sort=created_at&created_after=2025-01-01T00:00:00",
+            test_engine,
+            test_session,
+        )
+        assert "SEARCH questions USING INDEX ix_questions_created_at_id" in plan
+
+    async def test_unanswered_uses_partial_index(
+        self,
+        client: AsyncClient,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+    ):
+        plan = await listing_plan(
+            client,
+            "/api/questions/?sort=created_at&direction=desc&has_answers=false",
+            test_engine,
+            test_session,
+        )
+        assert "ix_questions_unanswered_created_at_id" in plan
@@ -1,7 +1,15 @@
+import re
+
+from fastapi_pagination import Params
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
-from core import Answer, Question
+from app.schemas import AnswerResponse, QuestionResponse
+from app.services import AnswerService, QuestionService, bulk
+from core import Answer, Question, settings
+from users import User
+from .utils import capture_statements, create_answer, fail_inserts_of
 
 
 class TestListQuestions:
@@ -68,6 +76,57 @@ class TestListQuestions:
         assert data["size"] == 50
         assert data["pages"] == 2
 
+    async def test_list_questions_custom_page_size(self, client: AsyncClient):
+        """Test that pages are sliced in a stable id order"""
+
+        ids = []
+        for i in range(5):
+            response = await client.post("/api/questions/", json={"text": f"Q{i}"})
+            ids.append(response.json()["id"])
+
+        response = await client.get("/api/questions/?page=2&size=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == ids[2:4]
+        assert data["total"] == 5
+        assert data["pages"] == 3
+
+
+class TestListQuestionsCursor:
+    """Tests for GET /api/questions/cursor endpoint"""
+
+    async def test_list_questions_cursor_walks_all_pages(self, client: AsyncClient):
+        """Test following next_cursor until the last page"""
+
+        ids = []
+        for i in range(5):
+            response = await client.post("/api/questions/", json={"text": f"Q{i}"})
+            ids.append(response.json()["id"])
+
+        seen = []
+        cursor = None
+        for _ in range(3):
+            params = {"size": 2} if cursor is None else {"size": 2, "cursor": cursor}
+            response = await client.get("/api/questions/cursor", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert "total" not in data
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+
+        assert seen == ids
+        assert cursor is None
+
+    async def test_list_questions_cursor_empty(self, client: AsyncClient):
+        response = await client.get("/api/questions/cursor")
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_cursor": None}
+
+    async def test_list_questions_cursor_invalid(self, client: AsyncClient):
+        response = await client.get("/api/questions/cursor?cursor=garbage")
+        assert response.status_code == 400
+        assert "cursor" in response.json()["detail"].lower()
+
 
 class TestCreateQuestion:
     """Tests for POST /api/questions/ endpoint"""
@@ -83,6 +142,20 @@ class TestCreateQuestion:
         assert "text" in data
         assert data["text"] == text
 
+    async def test_create_question_single_statement(
+        self, client: AsyncClient, test_engine: AsyncEngine
+    ):
+        """Test that creating a question is one INSERT ... RETURNING"""
+
+        with capture_statements(test_engine) as statements:
+            response = await client.post("/api/questions/", json={"text": "Why?"})
+        assert response.status_code == 201
+        assert response.json()["text"] == "Why?"
+
+        assert len(statements) == 1
+        assert statements[0][0].startswith("INSERT INTO questions")
+        assert "RETURNING" in statements[0][0]
+
     async def test_create_question_empty_text(self, client: AsyncClient):
         question_data = {"text": ""}
         response = await client.post("/api/questions/", json=question_data)
@@ -96,6 +169,72 @@ class TestCreateQuestion:
         assert response.status_code == 422
 
 
+class TestCreateQuestionsBulk:
+    """Tests for POST /api/questions/bulk endpoint"""
+
+    async def test_create_questions_bulk(self, client: AsyncClient):
+        items = [{"text": "Q0"}, {"text": ""}, {"text": "Q2"}, {}]
+        response = await client.post("/api/questions/bulk", json=items)
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["text"] for item in data["items"]] == ["Q0", "Q2"]
+        assert [error["index"] for error in data["errors"]] == [1, 3]
+        assert data["errors"][0]["errors"][0]["loc"] == ["text"]
+
+        response = await client.get("/api/questions/")
+        assert response.json()["total"] == 2
+
+    async def test_create_questions_bulk_chunks(
+        self, client: AsyncClient, test_engine: AsyncEngine, monkeypatch
+    ):
+        """Test that every chunk is committed on its own, in the given order"""
+
+        monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 2)
+        items = [{"text": f"Q{i}"} for i in range(5)]
+
+        # SQLite can't return rows in parameter order from one multi-row INSERT,
+        # so unlike PostgreSQL it runs one per row and only commits are counted
+        commits = []
+
+        def on_commit(conn):
+            commits.append(conn)
+
+        event.listen(test_engine.sync_engine, "commit", on_commit)
+        try:
+            response = await client.post("/api/questions/bulk", json=items)
+        finally:
+            event.remove(test_engine.sync_engine, "commit", on_commit)
+        assert response.status_code == 200
+        assert [item["text"] for item in response.json()["items"]] == [
+            item["text"] for item in items
+        ]
+        assert len(commits) == 3
+
+    async def test_create_questions_bulk_failed_chunk(
+        self, client: AsyncClient, test_engine: AsyncEngine, monkeypatch
+    ):
+        """Test that a failed chunk is reported by index, the others stored"""
+
+        monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 2)
+        items = [{"text": f"Q{i}"} for i in range(4)] + [{}, {"text": "Q5"}]
+
+        with fail_inserts_of(test_engine, "Q3"):
+            response = await client.post("/api/questions/bulk", json=items)
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["text"] for item in data["items"]] == ["Q0", "Q1", "Q5"]
+        assert [error["index"] for error in data["errors"]] == [2, 3, 4]
+        assert data["errors"][0]["errors"][0]["type"] == "not_stored"
+
+        response = await client.get("/api/questions/")
+        assert response.json()["total"] == 3
+
+    async def test_create_questions_bulk_too_many(self, client: AsyncClient):
+        items = [{"text": "Q"}] * (bulk.MAX_BULK_ITEMS + 1)
+        response = await client.post("/api/questions/bulk", json=items)
+        assert response.status_code == 422
+
+
 class TestGetQuestion:
     """Tests for GET /api/questions/{id} endpoint"""
 
@@ -115,6 +254,50 @@ class TestGetQuestion:
         assert data["text"] == test_question.text
         assert isinstance(data["answers"], list)
 
+    async def test_get_question_with_answers(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_answer: Answer,
+    ):
+        """Test that the detail explicitly loads the question's answers"""
+
+        await authenticated_client.post(
+            f"/api/questions/{test_question.id}/answers", json={"text": "Another"}
+        )
+
+        response = await authenticated_client.get(f"/api/questions/{test_question.id}")
+        assert response.status_code == 200
+        answers = response.json()["answers"]
+        assert len(answers) == 2
+        assert answers[0]["id"] == test_answer.id
+        assert answers[1]["text"] == "Another"
+
+    async def test_get_question_answers_limit(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+    ):
+        """Test that the detail embeds only the first answers and their count"""
+
+        for i in range(3):
+            await authenticated_client.post(
+                f"/api/questions/{test_question.id}/answers", json={"text": f"A{i}"}
+            )
+
+        response = await authenticated_client.get(
+            f"/api/questions/{test_question.id}?answers_limit=2"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [answer["text"] for answer in data["answers"]] == ["A0", "A1"]
+        assert data["answer_count"] == 3
+
+    async def test_get_question_not_found(self, client: AsyncClient):
+        response = await client.get("/api/questions/99999")
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"].lower()
+
 
 class TestDeleteQuestion:
     """Tests for DELETE /api/questions/{id} endpoint"""
@@ -161,3 +344,232 @@ class TestDeleteQuestion:
 
         deleted_answer = await test_session.get(Answer, answer_id)
         assert deleted_answer is None
+
+    async def test_delete_question_single_statement(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_answer: Answer,
+        test_session: AsyncSession,
+        test_engine: AsyncEngine,
+    ):
+        """Test that answers are not loaded to delete their question"""
+
+        for i in range(3):
+            await create_answer(
+                f"A{i}", test_question.id, test_answer.user_id, test_session
+            )
+
+        with capture_statements(test_engine) as statements:
+            response = await client.delete(f"/api/questions/{test_question.id}")
+        assert response.status_code == 204
+
+        assert len(statements) == 1
+        assert statements[0][0].startswith("DELETE FROM questions")
+
+
+class TestAnswerCounters:
+    """Tests for the answer counters denormalized on questions"""
+
+    async def test_counters_follow_answers(
+        self,
+        client: AsyncClient,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+    ):
+        url = f"/api/questions/{test_question.id}/answers"
+        first = (await authenticated_client.post(url, json={"text": "A0"})).json()
+        second = (await authenticated_client.post(url, json={"text": "A1"})).json()
+
+        listing = await client.get("/api/questions/")
+        (item,) = listing.json()["items"]
+        assert item["answer_count"] == 2
+        assert item["last_answer_at"] == second["created_at"]
+
+        await authenticated_client.delete(f"/api/answers/{second['id']}")
+
+        detail = await authenticated_client.get(f"/api/questions/{test_question.id}")
+        assert detail.json()["answer_count"] == 1
+        assert detail.json()["last_answer_at"] == first["created_at"]
+
+        listing = await client.get("/api/questions/")
+        assert listing.json()["items"][0]["answer_count"] == 1
+
+    async def test_counters_follow_cascaded_deletes(
+        self,
+        test_session: AsyncSession,
+        test_question: Question,
+        test_user: User,
+        test_user2: User,
+    ):
+        first = await create_answer("A0", test_question.id, test_user2.id, test_session)
+        await create_answer("A1", test_question.id, test_user.id, test_session)
+
+        # Not through the API, answers also go with their user
+        await test_session.execute(delete(User).where(User.id == test_user.id))
+        await test_session.commit()
+
+        answer_count, last_answer_at = (
+            await test_session.execute(
+                select(Question.answer_count, Question.last_answer_at).where(
+                    Question.id == test_question.id
+                )
+            )
+        ).one()
+        assert answer_count == 1
+        assert last_answer_at == first.created_at
+
+    async def test_bulk_answers_counted(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+    ):
+        response = await authenticated_client.post(
+            f"/api/questions/{test_question.id}/answers/bulk",
+            json=[{"text": "A0"}, {"text": "A1"}, {"text": "A2"}],
+        )
+        assert response.status_code == 200
+
+        detail = await authenticated_client.get(f"/api/questions/{test_question.id}")
+        assert detail.json()["answer_count"] == 3
+        assert detail.json()["last_answer_at"] is not None
+
+    async def test_sort_by_answer_count(
+        self,
+        client: AsyncClient,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+    ):
+        await authenticated_client.post(
+            f"/api/questions/{test_question2.id}/answers", json={"text": "A"}
+        )
+
+        response = await client.get("/api/questions/?sort=answer_count&direction=desc")
+        assert [item["id"] for item in response.json()["items"]] == [
+            test_question2.id,
+            test_question.id,
+        ]
+
+        response = await client.get("/api/questions/?sort=answer_count")
+        assert [item["id"] for item in response.json()["items"]] == [
+            test_question.id,
+            test_question2.id,
+        ]
+
+    async def test_sort_invalid(self, client: AsyncClient):
+        response = await client.get("/api/questions/?sort=text")
+        assert response.status_code == 422
+
+
+class TestListQuestionsFilters:
+    """Tests for sorting and filtering the questions listing"""
+
+    async def test_sort_by_created_at(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+    ):
+        response = await client.get("/api/questions/?sort=created_at&direction=desc")
+        assert [item["id"] for item in response.json()["items"]] == [
+            test_question2.id,
+            test_question.id,
+        ]
+
+    async def test_filter_created_range(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+    ):
+        response = await client.get(
+            "/api/questions/?sort=created_at&created_after=2000-01-01T00:00:00"
+        )
+        assert [item["id"] for item in response.json()["items"]] == [test_question.id]
+
+        response = await client.get(
+            "/api/questions/?sort=created_at&created_before=2000-01-01T00:00:00"
+        )
+        assert response.json()["items"] == []
+        assert response.json()["total"] == 0
+
+    async def test_filter_etag_is_valid(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+    ):
+        url = "/api/questions/?sort=created_at&created_after=2000-01-01T00:00:00"
+        response = await client.get(url)
+        etag = response.headers["etag"]
+        assert re.fullmatch(r'"[\x21\x23-\x7e]+"', etag)
+
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        response = await client.get(
+            "/api/questions/?sort=created_at&created_after=2001-01-01T00:00:00",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    async def test_filter_created_range_needs_created_at_sort(
+        self, client: AsyncClient
+    ):
+        response = await client.get("/api/questions/?created_after=2000-01-01T00:00:00")
+        assert response.status_code == 400
+
+    async def test_filter_has_answers(
+        self,
+        client: AsyncClient,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+    ):
+        await authenticated_client.post(
+            f"/api/questions/{test_question2.id}/answers", json={"text": "A"}
+        )
+
+        for sort in ("id", "created_at", "answer_count", "last_answer_at"):
+            answered = await client.get(f"/api/questions/?sort={sort}&has_answers=true")
+            assert [item["id"] for item in answered.json()["items"]] == [
+                test_question2.id
+            ]
+            assert answered.json()["total"] == 1
+
+            unanswered = await client.get(
+                f"/api/questions/?sort={sort}&has_answers=false"
+            )
+            assert [item["id"] for item in unanswered.json()["items"]] == [
+                test_question.id
+            ]
+
+
+class TestReadProjection:
+    """Tests that read paths select columns into response models"""
+
+    async def test_reads_hydrate_no_entities(
+        self,
+        test_engine: AsyncEngine,
+        test_question: Question,
+        test_answer: Answer,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(settings.api, "fast_json", False)
+        async with async_sessionmaker(test_engine)() as session:
+            questions = await QuestionService.list_questions(session, Params())
+            detail = await QuestionService.get_question(test_question.id, session)
+            answers = await AnswerService.list_answers(
+                test_question.id, session, Params()
+            )
+            answer = await AnswerService.get_answer(test_answer.id, session)
+            cursor_page = await AnswerService.list_answers_cursor(
+                test_question.id, session, None, 10
+            )
+
+            assert len(session.identity_map) == 0
+
+        assert all(isinstance(item, QuestionResponse) for item in questions.items)
+        assert detail.answers == answers.items == cursor_page.items == [answer]
+        assert isinstance(answer, AnswerResponse)
+        assert answer.text == test_answer.text
@@ -0,0 +1,100 @@
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from core import Answer, Question
+from core.search import search_matches, search_rank
+
+
+async def search(client: AsyncClient, **params) -> dict:
+    response = await client.get("/api/questions/search", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestSearchQuestions:
+    """Tests for GET /api/questions/search endpoint"""
+
+    async def test_search_ranked(self, client: AsyncClient):
+        for text in ("How to cook pasta?", "Python or pasta? Pasta!", "What is Go?"):
+            await client.post("/api/questions/", json={"text": text})
+
+        data = await search(client, q="pasta")
+        assert [item["text"] for item in data["items"]] == [
+            "Python or pasta? Pasta!",
+            "How to cook pasta?",
+        ]
+        assert data["total"] == 2
+
+    async def test_search_case_insensitive(
+        self, client: AsyncClient, test_question: Question
+    ):
+        data = await search(client, q="fastapi")
+        assert [item["id"] for item in data["items"]] == [test_question.id]
+
+    async def test_search_no_match(self, client: AsyncClient, test_question: Question):
+        data = await search(client, q="django")
+        assert data["items"] == []
+        assert data["total"] == 0
+
+    async def test_search_include_answers(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_question2: Question,
+        test_answer: Answer,
+    ):
+        data = await search(client, q="modern")
+        assert data["items"] == []
+
+        data = await search(client, q="modern", include_answers=True)
+        assert [item["id"] for item in data["items"]] == [test_question.id]
+
+    async def test_search_paginated(self, client: AsyncClient):
+        for i in range(3):
+            await client.post("/api/questions/", json={"text": f"Search me {i}"})
+
+        data = await search(client, q="search", size=2, page=2)
+        assert len(data["items"]) == 1
+        assert data["total"] == 3
+        assert data["pages"] == 2
+
+    async def test_search_requires_query(self, client: AsyncClient):
+        response = await client.get("/api/questions/search")
+        assert response.status_code == 422
+        response = await client.get("/api/questions/search?q=")
+        assert response.status_code == 422
+
+
+class TestPostgresSearch:
+    """Tests for the SQL the search compiles to on PostgreSQL"""
+
+    def test_generated_column_and_gin_index(self):
+        dialect = postgresql.dialect()
+        ddl = str(CreateTable(Question.__table__).compile(dialect=dialect))
+        assert (
+            "search_vector TSVECTOR GENERATED ALWAYS AS "
+            "(to_tsvector('english', text)) STORED" in ddl
+        )
+
+        (index,) = [
+            index
+            for index in Answer.__table__.indexes
+            if index.name == "ix_answers_search_vector"
+        ]
+        assert "USING gin (search_vector)" in str(
+            CreateIndex(index).compile(dialect=dialect)
+        )
+
+    def test_query_uses_stored_vector(self):
+        query = select(Question.id).where(
+            search_matches(Question.search_vector, "pasta")
+        )
+        query = query.order_by(search_rank(Question.search_vector, "pasta").desc())
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert (
+            "questions.search_vector @@ websearch_to_tsquery('english', %(param_1)s)"
+            in sql
+        )
+        assert "ts_rank_cd(questions.search_vector" in sql
@@ -0,0 +1,139 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
+import orjson
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas import AnswerResponse, QuestionDetail
+from app.serialization import build, dump_json, to_jsonable
+from app.services import QuestionService
+from core import Answer, Question, cache, settings
+
+USER_ID = UUID("1f92cea0-9152-486d-aa29-e977c6c5c8cd")
+READ_URLS = (
+    "/api/questions/?size=10",
+    "/api/questions/?sort=last_answer_at&direction=desc&has_answers=true",
+    "/api/questions/search?q=fastapi&include_answers=true",
+    "/api/questions/cursor?size=1",
+    "/api/questions/{question_id}",
+    "/api/questions/{question_id}?answers_limit=0",
+    "/api/questions/{question_id}/answers",
+    "/api/questions/{question_id}/answers/cursor?size=1",
+    "/api/answers/{answer_id}",
+)
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    monkeypatch.setattr(settings.api, "fast_json", True)
+
+
+def detail(answers: int) -> QuestionDetail:
+    created_at = datetime(2025, 11, 16, 12, 51, 27, 536294, tzinfo=UTC)
+    return build(
+        QuestionDetail,
+        id=1,
+        text="What is FastAPI?",
+        created_at=created_at,
+        answer_count=answers,
+        last_answer_at=created_at,
+        answers=[
+            Answer(
+                id=i,
+                text=f"Answer {i}",
+                question_id=1,
+                user_id=USER_ID,
+                created_at=created_at.replace(microsecond=0),
+            )
+            for i in range(answers)
+        ],
+    )
+
+
+class TestFastJSON:
+    """Tests for serializing responses with orjson instead of validating them"""
+
+    async def test_same_responses(
+        self,
+        client: AsyncClient,
+        monkeypatch,
+        test_question: Question,
+        test_question2: Question,
+        test_answer: Answer,
+    ):
+        urls = [
+            url.format(question_id=test_question.id, answer_id=test_answer.id)
+            for url in READ_URLS
+        ]
+        bodies = {}
+        for fast in (False, True):
+            monkeypatch.setattr(settings.api, "fast_json", fast)
+            await cache.clear()
+            responses = [await client.get(url) for url in urls]
+            assert [response.status_code for response in responses] == [200] * len(urls)
+            bodies[fast] = [response.json() for response in responses]
+
+        assert bodies[True] == bodies[False]
+
+    async def test_created_responses(
+        self, authenticated_client: AsyncClient, fast_json
+    ):
+        response = await authenticated_client.post(
+            "/api/questions/", json={"text": "Fast?"}
+        )
+        assert response.status_code == 201
+        assert response.json()["answer_count"] == 0
+        question_id = response.json()["id"]
+
+        response = await authenticated_client.post(
+            f"/api/questions/{question_id}/answers/bulk",
+            json=[{"text": "Yes"}, {"text": ""}],
+        )
+        assert response.status_code == 200
+        assert [item["text"] for item in response.json()["items"]] == ["Yes"]
+        assert response.json()["errors"][0]["index"] == 1
+
+    async def test_answer_keeps_validators(
+        self, client: AsyncClient, test_answer: Answer, fast_json
+    ):
+        response = await client.get(f"/api/answers/{test_answer.id}")
+        assert response.headers["content-type"] == "application/json"
+
+        response = await client.get(
+            f"/api/answers/{test_answer.id}",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == 304
+
+    def test_detail_matches_model_serialization(self, monkeypatch):
+        validated = dump_json(QuestionDetail, detail(3))
+        monkeypatch.setattr(settings.api, "fast_json", True)
+        fast = detail(3)
+
+        assert not isinstance(fast.answers[0], AnswerResponse)
+        assert orjson.loads(dump_json(QuestionDetail, fast)) == orjson.loads(validated)
+
+    async def test_detail_rows_not_validated(
+        self, test_session: AsyncSession, test_answer: Answer, fast_json
+    ):
+        detail = await QuestionService.get_question(
+            test_answer.question_id, test_session
+        )
+
+        assert detail.answers == [
+            {
+                "id": test_answer.id,
+                "text": test_answer.text,
+                "question_id": test_answer.question_id,
+                "user_id": test_answer.user_id,
+                "created_at": test_answer.created_at,
+            }
+        ]
+
+    def test_reads_mappings(self):
+        row = {"id": 1, "text": "Row?", "created_at": None}
+        row |= {"answer_count": 0, "last_answer_at": None, "answers": []}
+
+        assert to_jsonable(QuestionDetail, row) == row
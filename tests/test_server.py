@@ -0,0 +1,134 @@
+import os
+import runpy
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from prometheus_client import REGISTRY, generate_latest
+from uvicorn_worker import UvicornWorker
+
+from app.app import app
+from core import db_helper
+from core.metrics import metrics_registry
+from main import CONFIG_FILE
+
+
+@pytest.fixture
+def load_config(monkeypatch, tmp_path):
+    """Run gunicorn.conf.py with the given WEB_CONCURRENCY, restoring the
+    environment it changes afterwards"""
+
+    metrics_dir = tmp_path / "metrics"
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(metrics_dir))
+
+    def load(web_concurrency: str = "", cache_backend: str = "memory") -> dict:
+        monkeypatch.setenv("WEB_CONCURRENCY", web_concurrency)
+        monkeypatch.setenv("CACHE_BACKEND", cache_backend)
+        return runpy.run_path(str(CONFIG_FILE))
+
+    return load
+
+
+class TestGunicornConfig:
+    """Tests for the production server settings"""
+
+    def test_workers_default_to_available_cpus(self, load_config):
+        config = load_config()
+
+        assert config["workers"] == config["available_cpus"](config["cpu_quota"]())
+        assert os.environ["WEB_CONCURRENCY"] == str(config["workers"])
+        assert config["preload_app"] is True
+        assert config["max_requests"] > 0 and config["max_requests_jitter"] > 0
+        assert config["keepalive"] > 60
+
+    def test_web_concurrency_overrides_workers(self, load_config):
+        assert load_config("3")["workers"] == 3
+
+    @pytest.mark.parametrize(
+        "web_concurrency, cache_backend, expected",
+        [
+            ("1", "memory", "memory"),
+            ("2", "memory", "none"),
+            ("2", "redis", "redis"),
+            ("2", "none", "none"),
+        ],
+    )
+    def test_memory_cache_only_with_one_worker(
+        self, load_config, web_concurrency, cache_backend, expected
+    ):
+        load_config(web_concurrency, cache_backend)
+        assert os.environ["CACHE_BACKEND"] == expected
+
+    def test_workers_from_command_line_refused(self, load_config):
+        config = load_config("1")
+        server = SimpleNamespace(cfg=SimpleNamespace(workers=4))
+
+        with pytest.raises(RuntimeError, match="WEB_CONCURRENCY=4"):
+            config["on_starting"](server)
+
+        config["on_starting"](SimpleNamespace(cfg=SimpleNamespace(workers=1)))
+
+    def test_uvicorn_worker_on_uvloop_and_httptools(self, load_config):
+        worker = load_config()["worker_class"]
+
+        assert issubclass(worker, UvicornWorker)
+        assert worker.CONFIG_KWARGS == {"loop": "uvloop", "http": "httptools"}
+
+    def test_stale_metrics_removed(self, load_config):
+        stale = os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "counter_1.db")
+        os.makedirs(os.path.dirname(stale))
+        open(stale, "w").close()
+
+        load_config()
+
+        assert os.listdir(os.path.dirname(stale)) == []
+
+    @pytest.mark.parametrize(
+        "cpu_max, quota",
+        [("max 100000", None), ("400000 100000", 4), ("150000 100000", 1.5)],
+    )
+    def test_cpu_quota(self, load_config, tmp_path, cpu_max, quota):
+        path = tmp_path / "cpu.max"
+        path.write_text(cpu_max)
+
+        assert load_config()["cpu_quota"](str(path)) == quota
+
+    def test_cpu_quota_without_cgroup(self, load_config, tmp_path):
+        missing = str(tmp_path / "missing")
+        assert load_config()["cpu_quota"](missing, missing, missing) is None
+
+    @pytest.mark.parametrize("quota, cpus", [(None, 8), (1.5, 2), (0.5, 1), (16, 8)])
+    def test_available_cpus_within_quota(self, load_config, monkeypatch, quota, cpus):
+        available_cpus = load_config()["available_cpus"]
+        monkeypatch.setattr(os, "process_cpu_count", lambda: 8)
+
+        assert available_cpus(quota) == cpus
+
+
+class TestShutdown:
+    """Tests for releasing resources when a worker stops"""
+
+    async def test_lifespan_disposes_engines(self, monkeypatch):
+        dispose = AsyncMock()
+        monkeypatch.setattr(db_helper, "dispose", dispose)
+
+        async with app.router.lifespan_context(app):
+            dispose.assert_not_awaited()
+
+        dispose.assert_awaited_once()
+
+
+class TestMultiprocessMetrics:
+    """Tests for aggregating the metrics of gunicorn workers"""
+
+    def test_single_process_registry(self, monkeypatch):
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+        assert metrics_registry() is REGISTRY
+
+    def test_multiprocess_registry(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        registry = metrics_registry()
+
+        assert registry is not REGISTRY
+        assert b'db_pool_size{pool="primary"}' in generate_latest(registry)
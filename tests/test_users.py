@@ -0,0 +1,201 @@
+from threading import current_thread
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.app import app
+from core import Question, db_helper, settings
+from core.config import PasswordSettings
+from users import User, jwt_strategy
+from users.dependencies.user_manager import UserManager
+from users.password import PooledPasswordHelper, password_helper
+from users.schemas import UserUpdate
+from .utils import capture_statements
+
+
+def user_statements(statements: list) -> list[str]:
+    return [s for s, _ in statements if "FROM user " in s]
+
+
+class TestUserCache:
+    """Tests for resolving the authenticated user without the database"""
+
+    async def test_user_loaded_once(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_engine: AsyncEngine,
+    ):
+        """Test that only the first request with a token looks the user up"""
+
+        url = f"/api/questions/{test_question.id}/answers"
+        with capture_statements(test_engine) as statements:
+            response = await authenticated_client.post(url, json={"text": "A0"})
+        assert response.status_code == 201
+        assert len(user_statements(statements)) == 1
+
+        with capture_statements(test_engine) as statements:
+            response = await authenticated_client.post(url, json={"text": "A1"})
+        assert response.status_code == 201
+        assert user_statements(statements) == []
+
+    async def test_update_invalidates_user(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_user: User,
+        test_session: AsyncSession,
+    ):
+        """Test that a deactivated user is rejected on the next request"""
+
+        url = f"/api/questions/{test_question.id}/answers"
+        response = await authenticated_client.post(url, json={"text": "A0"})
+        assert response.status_code == 201
+
+        await UserManager(User.get_db(test_session)).update(
+            UserUpdate(is_active=False), test_user
+        )
+
+        response = await authenticated_client.post(url, json={"text": "A1"})
+        assert response.status_code == 401
+
+    async def test_cache_disabled(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_engine: AsyncEngine,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(settings.jwt, "cache_users", False)
+
+        url = f"/api/questions/{test_question.id}/answers"
+        for text in ("A0", "A1"):
+            with capture_statements(test_engine) as statements:
+                response = await authenticated_client.post(url, json={"text": text})
+            assert response.status_code == 201
+            assert len(user_statements(statements)) == 1
+
+
+class TestTrustedClaims:
+    """Tests for taking the user from signed token claims"""
+
+    async def test_no_user_lookup(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_user: User,
+        test_engine: AsyncEngine,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(settings.jwt, "trust_claims", True)
+
+        with capture_statements(test_engine) as statements:
+            response = await authenticated_client.post(
+                f"/api/questions/{test_question.id}/answers", json={"text": "Hi"}
+            )
+        assert response.status_code == 201
+        assert response.json()["user_id"] == str(test_user.id)
+        assert user_statements(statements) == []
+
+    async def test_inactive_claim_rejected(
+        self,
+        client: AsyncClient,
+        test_question: Question,
+        test_user: User,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(settings.jwt, "trust_claims", True)
+        test_user.is_active = False
+        token = await jwt_strategy.write_token(test_user)
+
+        response = await client.post(
+            f"/api/questions/{test_question.id}/answers",
+            json={"text": "Hi"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 401
+
+
+class TestSharedSession:
+    """Tests for the session shared by the route and the user dependencies"""
+
+    async def test_one_session_per_request(
+        self,
+        authenticated_client: AsyncClient,
+        test_question: Question,
+        test_session: AsyncSession,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(settings.jwt, "cache_users", False)
+        sessions = []
+
+        async def counting_session_dependency():
+            sessions.append(test_session)
+            yield test_session
+
+        app.dependency_overrides[db_helper.session_dependency] = (
+            counting_session_dependency
+        )
+
+        response = await authenticated_client.post(
+            f"/api/questions/{test_question.id}/answers", json={"text": "Hi"}
+        )
+        assert response.status_code == 201
+        assert len(sessions) == 1
+
+
+class TestPasswordHashing:
+    """Tests for hashing passwords off the event loop"""
+
+    async def test_register_and_login(self, client: AsyncClient, monkeypatch):
+        threads = []
+        hash_password = password_helper.hash
+
+        def recording_hash(password: str) -> str:
+            threads.append(current_thread().name)
+            return hash_password(password)
+
+        monkeypatch.setattr(password_helper, "hash", recording_hash)
+
+        credentials = {"email": "new@example.com", "password": "new_password"}
+        response = await client.post("/auth/jwt/register", json=credentials)
+        assert response.status_code == 201
+        assert threads and all(name.startswith("password") for name in threads)
+
+        response = await client.post(
+            "/auth/jwt/login",
+            data={"username": credentials["email"], "password": "new_password"},
+        )
+        assert response.status_code == 200
+        assert "access_token" in response.json()
+
+    async def test_login_wrong_password(self, client: AsyncClient, test_user: User):
+        response = await client.post(
+            "/auth/jwt/login",
+            data={"username": test_user.email, "password": "wrong_password"},
+        )
+        assert response.status_code == 400
+
+    async def test_login_rehashes_on_changed_parameters(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_session: AsyncSession,
+        monkeypatch,
+    ):
+        old_hash = test_user.hashed_password
+        cheaper = PooledPasswordHelper(
+            PasswordSettings(time_cost=1, memory_cost=1024, parallelism=1)
+        )
+
+        monkeypatch.setattr(password_helper, "password_hash", cheaper.password_hash)
+
+        response = await client.post(
+            "/auth/jwt/login",
+            data={"username": test_user.email, "password": "test_password"},
+        )
+        assert response.status_code == 200
+
+        await test_session.refresh(test_user)
+        assert test_user.hashed_password != old_hash
+        assert "m=1024,t=1,p=1" in test_user.hashed_password
@@ -1,9 +1,19 @@
+import inspect
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any
 from uuid import UUID
 
 from fastapi_users.password import PasswordHelper
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import CursorResult, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
 
 from app.app import app
+from app.budget import QueryBudget
 from core import Answer, Question, db_helper
 from users import User
 
@@ -11,14 +21,217 @@ from users import User
 def override_db_session(session: AsyncSession) -> None:
     """Override db session dependencies"""
 
-    def override_get_scoped_session():
-        return session
-
     async def override_session_dependency():
         yield session
 
-    app.dependency_overrides[db_helper.get_scoped_session] = override_get_scoped_session
     app.dependency_overrides[db_helper.session_dependency] = override_session_dependency
+    app.dependency_overrides[db_helper.read_session_dependency] = (
+        override_session_dependency
+    )
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Generator[list[tuple[str, Any]]]:
+    """Collect (statement, parameters) of every query run on the engine"""
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def fail_inserts_of(engine: AsyncEngine, text: str) -> Generator[None]:
+    """Fail every statement inserting the given text, as a timeout would"""
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        if statement.startswith("INSERT") and text in str(parameters):
+            raise OperationalError(statement, parameters, Exception("timeout"))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@dataclass
+class QueryLog:
+    """Statements, round trips and rows fetched while recording"""
+
+    # Rows fetched by every statement, None for server-side cursors
+    rows: list[int | None] = field(default_factory=list)
+    round_trips: int = 0
+
+    @property
+    def statements(self) -> int:
+        return len(self.rows)
+
+    @property
+    def max_rows(self) -> int:
+        return max((rows or 0 for rows in self.rows), default=0)
+
+    def assert_within(self, budget: QueryBudget, name: str) -> None:
+        assert self.statements <= budget.statements, (
+            f"{name} executed {self.statements} statements"
+            f", its budget is {budget.statements}"
+        )
+        assert self.round_trips <= budget.round_trips, (
+            f"{name} made {self.round_trips} round trips"
+            f", its budget is {budget.round_trips}"
+        )
+        if budget.rows is not None:
+            assert None not in self.rows and self.max_rows <= budget.rows, (
+                f"{name} fetched {self.max_rows} rows in one statement"
+                f", its budget is {budget.rows}"
+            )
+
+
+@contextmanager
+def record_queries(engine: AsyncEngine) -> Generator[QueryLog]:
+    """Record the statements run on the engine, counting the batches one
+    statement is sent in and transaction control as extra round trips, and
+    the rows of those run through a session on it"""
+
+    log = QueryLog()
+    contexts = []
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        log.round_trips += 1
+        if contexts and contexts[-1] is context:
+            # Another batch of the same statement
+            return
+        contexts.append(context)
+        log.rows.append(0)
+
+    def do_orm_execute(state: ORMExecuteState):
+        if state.session.bind is not engine.sync_engine:
+            return None
+        first = len(log.rows)
+        result = state.invoke_statement()
+        if first == len(log.rows):
+            return result
+        if isinstance(result, CursorResult) and not result.returns_rows:
+            return result
+        options = state.execution_options
+        if options.get("stream_results") or options.get("yield_per"):
+            # Fetched lazily by the caller, the rows can't be counted here
+            log.rows[first] = None
+            return result
+
+        frozen = result.freeze()
+        log.rows[first] = len(frozen.data)
+        return frozen()
+
+    listeners = [
+        (engine.sync_engine, "after_cursor_execute", after_cursor_execute),
+        (engine.sync_engine, "begin", transaction_control(log)),
+        (engine.sync_engine, "commit", transaction_control(log)),
+        (engine.sync_engine, "rollback", transaction_control(log)),
+        (Session, "do_orm_execute", do_orm_execute),
+    ]
+    for target, name, listener in listeners:
+        event.listen(target, name, listener)
+    try:
+        yield log
+    finally:
+        for target, name, listener in listeners:
+            event.remove(target, name, listener)
+
+
+def transaction_control(log: QueryLog) -> Callable:
+    def count_round_trip(conn, *args):
+        log.round_trips += 1
+
+    return count_round_trip
+
+
+def within_budget(
+    func: Callable, budget: QueryBudget, engine: AsyncEngine, name: str
+) -> Callable:
+    """Wrap an async function or async generator to assert that every call
+    stays within its query budget"""
+
+    if inspect.isasyncgenfunction(func):
+
+        @wraps(func)
+        async def checked_generator(*args, **kwargs):
+            with record_queries(engine) as log:
+                async for item in func(*args, **kwargs):
+                    yield item
+            log.assert_within(budget, name)
+
+        return checked_generator
+
+    @wraps(func)
+    async def checked(*args, **kwargs):
+        with record_queries(engine) as log:
+            result = await func(*args, **kwargs)
+        log.assert_within(budget, name)
+        return result
+
+    return checked
+
+
+async def explain_query_plan(
+    session: AsyncSession, statement: str, parameters: Any = ()
+) -> str:
+    """Get SQLite query plan details of a raw statement as one string"""
+
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(row[-1] for row in result)
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio client calls the cache makes"""
+
+    def __init__(self):
+        self.data: dict[str, dict[str, bytes]] = {}
+        self.ttls: dict[tuple[str, str], int] = {}
+        self._commands = []
+
+    async def hget(self, key: str, field: str) -> bytes | None:
+        return self.data.get(key, {}).get(field)
+
+    def hset(self, key: str, field: str, value: bytes) -> None:
+        self._commands.append(
+            lambda: self.data.setdefault(key, {}).update({field: value})
+        )
+
+    def hexpire(self, key: str, ttl: int, *fields: str) -> None:
+        self._commands.append(
+            lambda: self.ttls.update({(key, field): ttl for field in fields})
+        )
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match: str):
+        for key in list(self.data):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+    def pipeline(self, transaction: bool = True) -> "FakeRedis":
+        return self
+
+    async def execute(self) -> None:
+        for command in self._commands:
+            command()
+        self._commands.clear()
+
+    async def __aenter__(self) -> "FakeRedis":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
 
 
 async def create_user(email: str, password: str, session: AsyncSession) -> User:
@@ -47,6 +260,7 @@ async def create_answer(
         user_id=user_id,
     )
     session.add(answer)
-    await session.commit()
+    await session.flush()
     await session.refresh(answer)
+    await session.commit()
     return answer